@@ -56,6 +56,7 @@ while true; do
   broadcast=$(sqlite3 "$DB_PATH" \
     "SELECT COUNT(*) FROM messages
      WHERE to_agent = 'all' AND from_agent != '${AGENT_NAME}'
+     AND id > COALESCE((SELECT broadcast_highwater FROM agents WHERE name = '${AGENT_NAME}'), 0)
      AND id NOT IN (SELECT message_id FROM broadcast_reads WHERE agent_name = '${AGENT_NAME}');" \
     2>/dev/null || echo 0)
 
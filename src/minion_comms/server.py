@@ -12,7 +12,14 @@ import datetime
 import os
 import json
 import shutil
+import stat
 import subprocess
+import threading
+import atexit
+import functools
+import importlib.util
+import time
+import zlib
 
 # ---------------------------------------------------------------------------
 # Setup
@@ -26,28 +33,53 @@ RUNTIME_DIR = os.path.dirname(DB_PATH)
 
 mcp = FastMCP("Minion Comms")
 
+# orjson (optional, `pip install minion-comms[fast]`) serializes tool output
+# several times faster than stdlib json; fall back when it isn't installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj) -> str:
+    """Pretty-print tool output as JSON (2-space indent, UTF-8 kept as-is)."""
+    if orjson is not None:
+        # NON_STR_KEYS: stringify int keys the way stdlib json does
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
 # ---------------------------------------------------------------------------
 # Agent classes and model whitelists
 # ---------------------------------------------------------------------------
 
-VALID_CLASSES = {"lead", "coder", "builder", "oracle", "recon"}
+VALID_CLASSES = frozenset({"lead", "coder", "builder", "oracle", "recon"})
 
-BATTLE_PLAN_STATUSES = {"active", "superseded", "completed", "abandoned", "obsolete"}
-RAID_LOG_PRIORITIES = {"low", "normal", "high", "critical"}
-TASK_STATUSES = {
+BATTLE_PLAN_STATUSES = frozenset({"active", "superseded", "completed", "abandoned", "obsolete"})
+RAID_LOG_PRIORITIES = frozenset({"low", "normal", "high", "critical"})
+TASK_STATUSES = frozenset({
     "open", "assigned", "in_progress", "fixed", "verified",
     "closed", "abandoned", "stale", "obsolete",
-}
+})
+# Output shapes for the list tools (get_tasks, get_raid_log)
+LIST_FORMATS = frozenset({"json", "ids", "count"})
 
 # Models allowed per class. Empty set = any model allowed.
-CLASS_MODEL_WHITELIST: dict[str, set[str]] = {
-    "lead":    {"claude-opus-4-6", "claude-opus-4-5", "claude-sonnet-4-6", "claude-sonnet-4-5", "gemini-pro", "gemini-1.5-pro", "gemini-2.0-pro"},
-    "coder":   {"claude-opus-4-6", "claude-opus-4-5", "claude-sonnet-4-6", "claude-sonnet-4-5", "gemini-pro", "gemini-1.5-pro", "gemini-2.0-pro"},
-    "oracle":  set(),   # any model
-    "recon":   set(),   # any model
-    "builder": set(),   # any model (haiku fine)
+CLASS_MODEL_WHITELIST: dict[str, frozenset[str]] = {
+    "lead":    frozenset({"claude-opus-4-6", "claude-opus-4-5", "claude-sonnet-4-6", "claude-sonnet-4-5", "gemini-pro", "gemini-1.5-pro", "gemini-2.0-pro"}),
+    "coder":   frozenset({"claude-opus-4-6", "claude-opus-4-5", "claude-sonnet-4-6", "claude-sonnet-4-5", "gemini-pro", "gemini-1.5-pro", "gemini-2.0-pro"}),
+    "oracle":  frozenset(),   # any model
+    "recon":   frozenset(),   # any model
+    "builder": frozenset(),   # any model (haiku fine)
 }
 
+# Sorted, comma-joined forms for BLOCKED messages — built once at import
+_VALID_CLASSES_TEXT = ", ".join(sorted(VALID_CLASSES))
+_BATTLE_PLAN_STATUSES_TEXT = ", ".join(sorted(BATTLE_PLAN_STATUSES))
+_RAID_LOG_PRIORITIES_TEXT = ", ".join(sorted(RAID_LOG_PRIORITIES))
+_TASK_STATUSES_TEXT = ", ".join(sorted(TASK_STATUSES))
+_LIST_FORMATS_TEXT = ", ".join(sorted(LIST_FORMATS))
+_ALLOWED_MODELS_TEXT = {cls: ", ".join(sorted(m)) for cls, m in CLASS_MODEL_WHITELIST.items()}
+
 # Staleness thresholds per class (seconds). If set_context is older than this,
 # send() is BLOCKED. None = no enforcement (class not in map = no enforcement).
 CLASS_STALENESS_SECONDS: dict[str, int] = {
@@ -58,6 +90,17 @@ CLASS_STALENESS_SECONDS: dict[str, int] = {
     "oracle":  30 * 60,
 }
 
+# The same thresholds as a SQL expression over agents.agent_class (NULL = no enforcement)
+_STALENESS_THRESHOLD_SQL = "CASE agent_class {} END".format(
+    " ".join(f"WHEN '{cls}' THEN {secs}" for cls, secs in CLASS_STALENESS_SECONDS.items())
+)
+
+# Lookups shared by many tools. One string per statement keeps every call site on
+# the same entry in the connection's prepared-statement cache (cached_statements).
+_AGENT_CLASS_SQL = "SELECT agent_class FROM agents WHERE name = ?"
+_AGENT_EXISTS_SQL = "SELECT name FROM agents WHERE name = ?"
+_TASK_EXISTS_SQL = "SELECT 1 FROM tasks WHERE id = ?"
+
 # ---------------------------------------------------------------------------
 # Phase 7 — Trigger Words (brevity codes)
 # ---------------------------------------------------------------------------
@@ -77,38 +120,168 @@ TRIGGER_WORDS: dict[str, str] = {
 # DB helpers
 # ---------------------------------------------------------------------------
 
-def get_db() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH, timeout=1)
+_local = threading.local()
+_all_conns: list[sqlite3.Connection] = []
+
+
+def _connect() -> sqlite3.Connection:
+    """Open and tune a new connection to DB_PATH."""
+    # timeout doubles as busy_timeout: concurrent agents wait for the write lock
+    # instead of failing with "database is locked".
+    # The tools issue ~150 distinct statements; size the prepared-statement
+    # cache (default 128) so a long session never evicts the hot ones.
+    conn = sqlite3.connect(
+        DB_PATH, timeout=5, check_same_thread=False, cached_statements=256
+    )
     conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
+    # Per-connection tuning. journal_mode=WAL is persistent — set once in init_db().
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA cache_size=-65536")
+    _all_conns.append(conn)
     return conn
 
 
-def _get_lead(cursor: sqlite3.Cursor) -> str | None:
-    """Return the name of the first registered lead agent, or None."""
-    cursor.execute("SELECT name FROM agents WHERE agent_class = 'lead' LIMIT 1")
-    row = cursor.fetchone()
-    return row[0] if row else None
+def get_db() -> sqlite3.Connection:
+    """Return this thread's long-lived connection, opening it on first use.
+
+    Reusing the connection keeps SQLite's page cache and statement cache warm
+    across tool calls. Tools must not close it — they end with conn.rollback()
+    in their finally block so an early return never leaves a transaction open.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _local.conn = _connect()
+    return conn
+
+
+def get_read_db() -> sqlite3.Connection:
+    """Return this thread's long-lived read-only connection (query_only).
+
+    Read-only tools use it so they never contend for, or accidentally take,
+    the write lock; under WAL they read a consistent snapshot while writers
+    commit. Same lifecycle rules as get_db().
+    """
+    if DB_PATH == ":memory:":
+        return get_db()  # a second connection would see a different database
+    conn = getattr(_local, "read_conn", None)
+    if conn is None:
+        conn = _local.read_conn = _connect()
+        conn.execute("PRAGMA query_only=ON")
+    return conn
+
+
+@atexit.register
+def _close_all_db() -> None:
+    """Close every cached connection on shutdown (checkpoints the WAL).
+
+    PRAGMA optimize first refreshes planner statistics for tables that have
+    grown since the last ANALYZE, as SQLite recommends before closing. It only
+    considers queries run on the same connection, so the query_only readers
+    are switched back to writable first or their ANALYZE would fail.
+    """
+    for conn in _all_conns:
+        try:
+            conn.execute("PRAGMA query_only=OFF")
+            conn.execute("PRAGMA optimize")
+        except sqlite3.Error:
+            pass  # best effort; never block shutdown
+        conn.close()
+
+
+def _now_iso() -> str:
+    """Current local time as an ISO string — the format of every stored *_at column.
+
+    Always carries microseconds, so stored timestamps are fixed-width and sort
+    correctly as text.
+    """
+    return datetime.datetime.now().isoformat(timespec="microseconds")
+
+
+def _dicts(cursor: sqlite3.Cursor) -> list[dict]:
+    """Fetch the executed query's rows as plain dicts.
+
+    Column names are read from cursor.description once and zipped onto raw
+    tuples, skipping the per-row sqlite3.Row wrapper.
+    """
+    cols = [d[0] for d in cursor.description]
+    factory = cursor.row_factory
+    cursor.row_factory = None
+    try:
+        return [dict(zip(cols, r)) for r in cursor.fetchall()]
+    finally:
+        cursor.row_factory = factory
+
+
+# agents columns used only for internal bookkeeping; stripped from who()
+_AGENT_INTERNAL_COLUMNS = ("last_seen_epoch", "context_updated_at_epoch", "broadcast_highwater")
+
+
+# Message bodies at least this large are stored zlib-compressed in content_z
+# (content stays NULL). Ordinary chatter is left as readable TEXT.
+_COMPRESS_MIN_BYTES = 4096
+
+
+def _pack_content(message: str) -> tuple[str | None, bytes | None]:
+    """Return the (content, content_z) pair to store for a message body."""
+    raw = message.encode()
+    if len(raw) < _COMPRESS_MIN_BYTES:
+        return message, None
+    packed = zlib.compress(raw)
+    if len(packed) >= len(raw):
+        return message, None
+    return None, packed
+
+
+def _unpack_messages(msgs: list[dict]) -> list[dict]:
+    """Turn stored message rows into tool output (in place): inflate content_z
+    back into content and drop the storage-only columns."""
+    for m in msgs:
+        m.pop("ts_epoch", None)
+        packed = m.pop("content_z", None)
+        if packed is not None:
+            m["content"] = zlib.decompress(packed).decode()
+    return msgs
+
+
+@functools.lru_cache(maxsize=16)
+def _read_cached(path: str, mtime_ns: int) -> str:
+    """Read a file once per (path, mtime) — edits on disk produce a new key."""
+    with open(path, "r") as f:
+        return f.read()
+
+
+def _read_if_exists(path: str) -> str | None:
+    """Return file contents via _read_cached, or None if the file is missing."""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    return _read_cached(path, mtime_ns)
 
 
 def _load_onboarding(agent_class: str) -> str:
     """Load protocol + class profile from runtime directory."""
     parts: list[str] = []
 
-    protocol_path = os.path.join(RUNTIME_DIR, "PROTOCOL.md")
-    if os.path.exists(protocol_path):
-        with open(protocol_path, "r") as f:
-            parts.append(f.read())
+    protocol = _read_if_exists(os.path.join(RUNTIME_DIR, "PROTOCOL.md"))
+    if protocol is not None:
+        parts.append(protocol)
 
     if agent_class:
-        class_path = os.path.join(RUNTIME_DIR, "classes", f"{agent_class}.md")
-        if os.path.exists(class_path):
-            with open(class_path, "r") as f:
-                parts.append(f.read())
+        profile = _read_if_exists(os.path.join(RUNTIME_DIR, "classes", f"{agent_class}.md"))
+        if profile is not None:
+            parts.append(profile)
 
     return "\n\n---\n\n".join(parts) if parts else ""
 
 
+def _preview(text: str, limit: int = 80) -> str:
+    """Truncate text for a one-line tool response, marking the cut with '...'."""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
 def _hp_summary(tokens_used: int | None, tokens_limit: int | None) -> str:
     """Return a human-readable HP string, e.g. '45% HP (92k/200k)'."""
     if not tokens_used or not tokens_limit:
@@ -125,21 +298,22 @@ def _staleness_check(cursor: sqlite3.Cursor, agent_name: str) -> tuple[bool, str
     Returns (is_stale, message). is_stale=True means BLOCKED.
     """
     cursor.execute(
-        "SELECT agent_class, last_seen, context_updated_at FROM agents WHERE name = ?",
+        "SELECT agent_class, context_updated_at_epoch FROM agents WHERE name = ?",
         (agent_name,),
     )
     row = cursor.fetchone()
     if not row:
         return False, ""
+    return _staleness_verdict(row["agent_class"], row["context_updated_at_epoch"])
 
-    agent_class = row["agent_class"]
-    context_updated_at = row["context_updated_at"]
 
+def _staleness_verdict(agent_class: str | None, context_updated_at_epoch: int | None) -> tuple[bool, str]:
+    """Staleness verdict for an already-fetched agent row (see _staleness_check)."""
     threshold = CLASS_STALENESS_SECONDS.get(agent_class)
     if threshold is None:
         return False, ""
 
-    if not context_updated_at:
+    if context_updated_at_epoch is None:
         # Never set context — stale by definition
         return (
             True,
@@ -147,12 +321,7 @@ def _staleness_check(cursor: sqlite3.Cursor, agent_name: str) -> tuple[bool, str
             f"({agent_class} threshold: {threshold // 60} min)",
         )
 
-    try:
-        updated = datetime.datetime.fromisoformat(context_updated_at)
-    except ValueError:
-        return False, ""
-
-    age_seconds = (datetime.datetime.now() - updated).total_seconds()
+    age_seconds = int(time.time()) - context_updated_at_epoch
     if age_seconds > threshold:
         mins = int(age_seconds // 60)
         return (
@@ -164,6 +333,35 @@ def _staleness_check(cursor: sqlite3.Cursor, agent_name: str) -> tuple[bool, str
     return False, ""
 
 
+# last_seen is a heartbeat shown at minute resolution; rewriting it on every
+# tool call dirties the agents page for nothing. Refresh at most this often.
+LAST_SEEN_RESOLUTION_SECONDS = 30
+
+
+def _touch_agent(cursor: sqlite3.Cursor, agent_name: str, now: str) -> sqlite3.Row | None:
+    """Refresh agent_name's last_seen heartbeat, doubling as the registration check.
+
+    Returns the agent's (agent_class, context_updated_at_epoch) row, or None
+    if the agent isn't registered. last_seen is only rewritten once it is
+    LAST_SEEN_RESOLUTION_SECONDS old, so most calls are a single indexed read.
+    Callers that bail out on None leave the transaction to the finally-rollback.
+    """
+    cursor.execute(
+        "SELECT agent_class, context_updated_at_epoch, last_seen_epoch FROM agents WHERE name = ?",
+        (agent_name,),
+    )
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    seen = row["last_seen_epoch"]
+    if seen is None or time.time() - seen >= LAST_SEEN_RESOLUTION_SECONDS:
+        cursor.execute(
+            "UPDATE agents SET last_seen = ?, last_seen_epoch = strftime('%s', 'now') WHERE name = ?",
+            (now, agent_name),
+        )
+    return row
+
+
 def _scan_triggers(message: str) -> list[str]:
     """Return list of trigger words found in message text."""
     # Case-insensitive word boundary scan
@@ -187,15 +385,29 @@ def _format_trigger_codebook() -> str:
     return "\n".join(lines)
 
 
+# TRIGGER_WORDS is fixed for the life of the process — format the codebook once
+_TRIGGER_CODEBOOK = _format_trigger_codebook()
+
+
 # ---------------------------------------------------------------------------
 # DB initialization
 # ---------------------------------------------------------------------------
 
+# Tables present once init_db() has run; the schema is fixed after that
+_TABLES: frozenset[str] = frozenset()
+
+
 def init_db() -> None:
+    global _TABLES
     os.makedirs(RUNTIME_DIR, exist_ok=True)
     conn = get_db()
     cursor = conn.cursor()
 
+    # WAL lets readers and the writer proceed concurrently. The mode is stored
+    # in the DB file, so it only needs setting once per database.
+    if DB_PATH != ":memory:":
+        cursor.execute("PRAGMA journal_mode=WAL")
+
     # agents — v2 schema: agent_class + model instead of role
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS agents (
@@ -211,10 +423,33 @@ def init_db() -> None:
             context             TEXT DEFAULT NULL,
             context_tokens_used   INTEGER DEFAULT NULL,
             context_tokens_limit  INTEGER DEFAULT NULL,
-            transport             TEXT DEFAULT 'terminal'
+            transport             TEXT DEFAULT 'terminal',
+            last_seen_epoch           INTEGER DEFAULT NULL,
+            context_updated_at_epoch  INTEGER DEFAULT NULL,
+            broadcast_highwater       INTEGER DEFAULT 0
         )
     """)
 
+    # Unix-epoch mirrors of last_seen / context_updated_at: staleness checks do
+    # integer math instead of parsing ISO strings. Backfill older databases
+    # (stored ISO strings are naive local time, hence the 'utc' modifier).
+    agent_cols = {r[1] for r in cursor.execute("PRAGMA table_info(agents)")}
+    for epoch_col, iso_col in (
+        ("last_seen_epoch", "last_seen"),
+        ("context_updated_at_epoch", "context_updated_at"),
+    ):
+        if epoch_col not in agent_cols:
+            cursor.execute(f"ALTER TABLE agents ADD COLUMN {epoch_col} INTEGER DEFAULT NULL")
+            cursor.execute(
+                f"UPDATE agents SET {epoch_col} = CAST(strftime('%s', {iso_col}, 'utc') AS INTEGER) "
+                f"WHERE {iso_col} IS NOT NULL"
+            )
+
+    # Every broadcast with id <= broadcast_highwater has been read by the agent,
+    # so unread-broadcast queries only anti-join the ids above it. 0 = no bound.
+    if "broadcast_highwater" not in agent_cols:
+        cursor.execute("ALTER TABLE agents ADD COLUMN broadcast_highwater INTEGER DEFAULT 0")
+
     # messages
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS messages (
@@ -225,10 +460,24 @@ def init_db() -> None:
             timestamp       TEXT,
             read_flag       INTEGER DEFAULT 0,
             is_cc           INTEGER DEFAULT 0,
-            cc_original_to  TEXT DEFAULT NULL
+            cc_original_to  TEXT DEFAULT NULL,
+            content_z       BLOB DEFAULT NULL,
+            ts_epoch        INTEGER DEFAULT NULL
         )
     """)
 
+    # content_z (compressed large bodies) was added later — migrate older databases
+    message_cols = {r[1] for r in cursor.execute("PRAGMA table_info(messages)")}
+    if "content_z" not in message_cols:
+        cursor.execute("ALTER TABLE messages ADD COLUMN content_z BLOB DEFAULT NULL")
+    # ts_epoch mirrors timestamp as Unix seconds for numeric age cutoffs (purge/register)
+    if "ts_epoch" not in message_cols:
+        cursor.execute("ALTER TABLE messages ADD COLUMN ts_epoch INTEGER DEFAULT NULL")
+        cursor.execute(
+            "UPDATE messages SET ts_epoch = CAST(strftime('%s', timestamp, 'utc') AS INTEGER) "
+            "WHERE timestamp IS NOT NULL"
+        )
+
     # broadcast read tracking
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS broadcast_reads (
@@ -324,8 +573,75 @@ def init_db() -> None:
         )
     """)
 
+    # Indexes for the hot lookup paths
+    indexes_before = {
+        r[0] for r in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    }
+    # Unread direct messages (send/check_inbox) and broadcast enumeration
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_messages_to_unread ON messages(to_agent, read_flag, id)"
+    )
+    # Age cutoffs on ts_epoch: purge_inbox's per-agent delete and the broadcast
+    # cutoffs in register/purge_inbox (to_agent = 'all')
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_messages_to_epoch ON messages(to_agent, ts_epoch)"
+    )
+    # Dangling-row cleanup in purge_inbox probes by message_id alone
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_broadcast_reads_msgid ON broadcast_reads(message_id)"
+    )
+    # Lead lookup in send() and other class lookups
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_agents_class ON agents(agent_class)")
+    # Task lists: get_tasks / cold_start filter by status and page by created_at
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_status_created ON tasks(status, created_at)"
+    )
+    # Default get_tasks listing: active tasks only, newest first. get_tasks
+    # names it with INDEXED BY (the planner won't pick it without stats), and its
+    # WHERE must match the literal IN list there or that query fails to prepare.
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_active ON tasks(created_at) "
+        "WHERE status IN ('open', 'assigned', 'in_progress')"
+    )
+    # Per-agent active task lookups (party_status, check_activity)
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_assigned_status ON tasks(assigned_to, status)"
+    )
+    # Active-plan checks (send, create_task) and get_battle_plan's status listing
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_battle_plan_status ON battle_plan(status, created_at)"
+    )
+    # Head-of-waitlist lookups (release_file, deregister)
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_file_waitlist_file_added ON file_waitlist(file_path, added_at)"
+    )
+    # Raid log pages newest-first, optionally filtered by priority or agent
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_raid_log_created ON raid_log(created_at)")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_raid_log_priority ON raid_log(priority, created_at)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_raid_log_agent ON raid_log(agent_name, created_at)"
+    )
+    # end_session's debrief gate: only DEBRIEF FILED rows are indexed, so the check
+    # is a point lookup instead of walking every critical entry
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_raid_log_debrief ON raid_log(priority) "
+        "WHERE entry LIKE 'DEBRIEF FILED:%'"
+    )
+
+    # Gather planner statistics only for indexes this call created; existing
+    # ones are kept current by PRAGMA optimize in _close_all_db. A full ANALYZE
+    # here would rescan every table on each server start.
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL")
+    for (index_name,) in cursor.fetchall():
+        if index_name not in indexes_before:
+            cursor.execute(f'ANALYZE "{index_name}"')
+
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    _TABLES = frozenset(row[0] for row in cursor.fetchall())
+
     conn.commit()
-    conn.close()
 
 
 # ---------------------------------------------------------------------------
@@ -354,28 +670,33 @@ def register(
     if agent_class not in VALID_CLASSES:
         return (
             f"BLOCKED: Unknown class '{agent_class}'. "
-            f"Valid classes: {', '.join(sorted(VALID_CLASSES))}"
+            f"Valid classes: {_VALID_CLASSES_TEXT}"
         )
 
     # Model whitelist check
-    allowed_models = CLASS_MODEL_WHITELIST.get(agent_class, set())
+    allowed_models = CLASS_MODEL_WHITELIST.get(agent_class, frozenset())
     if allowed_models and model and model not in allowed_models:
         return (
             f"BLOCKED: Model '{model}' is not allowed for class '{agent_class}'. "
-            f"Allowed: {', '.join(sorted(allowed_models))}"
+            f"Allowed: {_ALLOWED_MODELS_TEXT[agent_class]}"
         )
 
     conn = get_db()
     cursor = conn.cursor()
-    now = datetime.datetime.now().isoformat()
+    now_dt = datetime.datetime.now()
+    now = now_dt.isoformat(timespec="microseconds")
     try:
+        # Upsert + broadcast backfill commit together
+        cursor.execute("BEGIN IMMEDIATE")
         cursor.execute(
             """
             INSERT INTO agents
-                (name, agent_class, model, registered_at, last_seen, description, status, transport)
-            VALUES (?, ?, ?, ?, ?, ?, 'waiting for work', ?)
+                (name, agent_class, model, registered_at, last_seen, last_seen_epoch,
+                 description, status, transport)
+            VALUES (?, ?, ?, ?, ?, strftime('%s', 'now'), ?, 'waiting for work', ?)
             ON CONFLICT(name) DO UPDATE SET
                 last_seen   = excluded.last_seen,
+                last_seen_epoch = excluded.last_seen_epoch,
                 agent_class = excluded.agent_class,
                 model       = COALESCE(NULLIF(excluded.model, ''), agents.model),
                 description = COALESCE(NULLIF(excluded.description, ''), agents.description),
@@ -385,14 +706,20 @@ def register(
             (agent_name, agent_class, model or None, now, now, description or None, transport),
         )
 
-        # Auto-mark broadcasts older than 1 hour as read (don't blast new agents with history)
-        cutoff = (datetime.datetime.now() - datetime.timedelta(hours=1)).isoformat()
+        # Auto-mark broadcasts older than 1 hour as read (don't blast new agents with history).
+        # Raising the highwater to the newest such broadcast covers them all with one
+        # row update instead of a broadcast_reads row per message.
+        cutoff_epoch = int(now_dt.timestamp()) - 3600
         cursor.execute(
             """
-            INSERT OR IGNORE INTO broadcast_reads (agent_name, message_id)
-            SELECT ?, id FROM messages WHERE to_agent = 'all' AND timestamp < ?
+            UPDATE agents SET broadcast_highwater = MAX(
+                COALESCE(broadcast_highwater, 0),
+                COALESCE((SELECT id FROM messages WHERE to_agent = 'all' AND ts_epoch <= ?
+                          ORDER BY ts_epoch DESC, id DESC LIMIT 1), 0)
+            )
+            WHERE name = ?
             """,
-            (agent_name, cutoff),
+            (cutoff_epoch, agent_name),
         )
 
         conn.commit()
@@ -413,13 +740,13 @@ def register(
             )
 
         # Phase 7: append trigger word codebook to onboarding
-        result += f"\n\n---\n\n{_format_trigger_codebook()}"
+        result += f"\n\n---\n\n{_TRIGGER_CODEBOOK}"
 
         return result
     except Exception as e:
         return f"Error registering agent: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 @mcp.tool()
@@ -429,29 +756,26 @@ def deregister(agent_name: str) -> str:
     conn = get_db()
     cursor = conn.cursor()
     try:
-        cursor.execute("SELECT name FROM agents WHERE name = ?", (agent_name,))
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute(_AGENT_EXISTS_SQL, (agent_name,))
         if not cursor.fetchone():
             return f"Agent '{agent_name}' not found."
 
-        # Phase 4: release all file claims held by this agent
+        # Phase 4: release all file claims held by this agent, noting the head
+        # of each file's waitlist in the same pass
         cursor.execute(
-            "SELECT file_path FROM file_claims WHERE agent_name = ?",
+            """SELECT fc.file_path,
+                      (SELECT w.agent_name FROM file_waitlist w WHERE w.file_path = fc.file_path
+                       ORDER BY w.added_at ASC LIMIT 1) AS waiter
+               FROM file_claims fc WHERE fc.agent_name = ?""",
             (agent_name,),
         )
-        claimed_files = [row["file_path"] for row in cursor.fetchall()]
-        waitlist_notes: list[str] = []
-        for fp in claimed_files:
-            cursor.execute(
-                "DELETE FROM file_claims WHERE file_path = ?", (fp,)
-            )
-            # Check waitlist for this file
-            cursor.execute(
-                "SELECT agent_name FROM file_waitlist WHERE file_path = ? ORDER BY added_at ASC LIMIT 1",
-                (fp,),
-            )
-            waiter = cursor.fetchone()
-            if waiter:
-                waitlist_notes.append(f"{fp} -> {waiter['agent_name']} waiting")
+        claims = cursor.fetchall()
+        claimed_files = [row["file_path"] for row in claims]
+        waitlist_notes = [
+            f"{row['file_path']} -> {row['waiter']} waiting" for row in claims if row["waiter"]
+        ]
+        cursor.execute("DELETE FROM file_claims WHERE agent_name = ?", (agent_name,))
         # Remove agent from any waitlists they were on
         cursor.execute(
             "DELETE FROM file_waitlist WHERE agent_name = ?", (agent_name,)
@@ -469,7 +793,7 @@ def deregister(agent_name: str) -> str:
     except Exception as e:
         return f"Error deregistering agent: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 @mcp.tool()
@@ -479,10 +803,12 @@ def rename(old_name: str, new_name: str) -> str:
     conn = get_db()
     cursor = conn.cursor()
     try:
-        cursor.execute("SELECT name FROM agents WHERE name = ?", (old_name,))
+        # Existence checks and the five UPDATEs run in one write transaction
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute(_AGENT_EXISTS_SQL, (old_name,))
         if not cursor.fetchone():
             return f"Agent '{old_name}' not found."
-        cursor.execute("SELECT name FROM agents WHERE name = ?", (new_name,))
+        cursor.execute(_AGENT_EXISTS_SQL, (new_name,))
         if cursor.fetchone():
             return f"Agent '{new_name}' already exists. Choose a different name."
         cursor.execute("UPDATE agents SET name = ? WHERE name = ?", (new_name, old_name))
@@ -495,7 +821,7 @@ def rename(old_name: str, new_name: str) -> str:
     except Exception as e:
         return f"Error renaming agent: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 @mcp.tool()
@@ -504,10 +830,10 @@ def set_status(agent_name: str, status: str) -> str:
     Examples: 'working on BUG-014', 'waiting for work', 'reviewing auth module'."""
     conn = get_db()
     cursor = conn.cursor()
-    now = datetime.datetime.now().isoformat()
+    now = _now_iso()
     try:
         cursor.execute(
-            "UPDATE agents SET status = ?, last_seen = ? WHERE name = ?",
+            "UPDATE agents SET status = ?, last_seen = ?, last_seen_epoch = strftime('%s', 'now') WHERE name = ?",
             (status, now, agent_name),
         )
         conn.commit()
@@ -515,7 +841,7 @@ def set_status(agent_name: str, status: str) -> str:
     except Exception as e:
         return f"Error setting status: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 @mcp.tool()
@@ -533,7 +859,7 @@ def set_context(
     """
     conn = get_db()
     cursor = conn.cursor()
-    now = datetime.datetime.now().isoformat()
+    now = _now_iso()
     try:
         cursor.execute(
             """UPDATE agents
@@ -541,7 +867,9 @@ def set_context(
                    context_tokens_used  = NULLIF(?, 0),
                    context_tokens_limit = NULLIF(?, 0),
                    context_updated_at   = ?,
-                   last_seen            = ?
+                   context_updated_at_epoch = strftime('%s', 'now'),
+                   last_seen            = ?,
+                   last_seen_epoch      = strftime('%s', 'now')
                WHERE name = ?""",
             (context, tokens_used, tokens_limit, now, now, agent_name),
         )
@@ -556,56 +884,52 @@ def set_context(
     except Exception as e:
         return f"Error setting context: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 @mcp.tool()
 def who() -> str:
     """List all registered agents with class, HP, status, and staleness flags.
     Lead calls this to monitor party health."""
-    conn = get_db()
+    conn = get_read_db()
     cursor = conn.cursor()
-    now = datetime.datetime.now()
+    now_epoch = int(time.time())
     try:
-        cursor.execute("SELECT * FROM agents ORDER BY last_seen DESC")
+        # Ages and staleness are computed by SQLite from the epoch columns
+        cursor.execute(
+            f"""
+            SELECT *,
+                (? - last_seen_epoch) / 60 AS last_seen_mins_ago,
+                CASE
+                    WHEN {_STALENESS_THRESHOLD_SQL} IS NULL THEN 0
+                    WHEN context_updated_at_epoch IS NULL THEN 1
+                    ELSE ? - context_updated_at_epoch > {_STALENESS_THRESHOLD_SQL}
+                END AS context_stale
+            FROM agents ORDER BY last_seen DESC
+            """,
+            (now_epoch, now_epoch),
+        )
         agents = []
-        for row in cursor.fetchall():
-            a = dict(row)
+        for a in _dicts(cursor):
+            for col in _AGENT_INTERNAL_COLUMNS:
+                del a[col]
+            stale = a.pop("context_stale")
+            mins_ago = a.pop("last_seen_mins_ago")
 
-            # HP summary
             a["hp"] = _hp_summary(a.get("context_tokens_used"), a.get("context_tokens_limit"))
-
-            # Staleness flag
-            threshold = CLASS_STALENESS_SECONDS.get(a.get("agent_class", ""), None)
-            stale = False
-            if threshold and a.get("context_updated_at"):
-                try:
-                    updated = datetime.datetime.fromisoformat(a["context_updated_at"])
-                    stale = (now - updated).total_seconds() > threshold
-                except ValueError:
-                    pass
-            elif threshold and not a.get("context_updated_at"):
-                stale = True
-            a["context_stale"] = stale
-
-            # Last-seen age
-            if a.get("last_seen"):
-                try:
-                    ls = datetime.datetime.fromisoformat(a["last_seen"])
-                    age_min = int((now - ls).total_seconds() // 60)
-                    a["last_seen_mins_ago"] = age_min
-                except ValueError:
-                    pass
+            a["context_stale"] = bool(stale)
+            if mins_ago is not None:
+                a["last_seen_mins_ago"] = mins_ago
 
             agents.append(a)
 
         if not agents:
             return "No agents registered."
-        return json.dumps(agents, indent=2)
+        return _dumps(agents)
     except Exception as e:
         return f"Error listing agents: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 @mcp.tool()
@@ -628,26 +952,34 @@ def send(
     """
     conn = get_db()
     cursor = conn.cursor()
-    now = datetime.datetime.now().isoformat()
+    now = _now_iso()
     try:
-        # --- inbox discipline: must read before sending ---
-        cursor.execute(
-            "SELECT COUNT(*) FROM messages WHERE to_agent = ? AND read_flag = 0",
-            (from_agent,),
-        )
-        unread_direct = cursor.fetchone()[0]
+        # One write transaction: the gates below see the same snapshot the inserts commit to
+        cursor.execute("BEGIN IMMEDIATE")
 
+        # All send gates in one round trip. Selecting from a one-row stub and
+        # LEFT JOINing the sender keeps the counts when the sender is unregistered.
         cursor.execute(
             """
-            SELECT COUNT(*) FROM messages
-            WHERE to_agent = 'all' AND from_agent != ?
-            AND id NOT IN (SELECT message_id FROM broadcast_reads WHERE agent_name = ?)
+            SELECT
+                (SELECT COUNT(*) FROM messages
+                 WHERE to_agent = ? AND read_flag = 0) AS unread_direct,
+                (SELECT COUNT(*) FROM messages m
+                 LEFT JOIN broadcast_reads b ON b.message_id = m.id AND b.agent_name = ?
+                 WHERE m.id > COALESCE(a.broadcast_highwater, 0)
+                   AND m.to_agent = 'all' AND m.from_agent != ? AND b.message_id IS NULL) AS unread_broadcast,
+                EXISTS (SELECT 1 FROM battle_plan WHERE status = 'active') AS has_plan,
+                (SELECT name FROM agents WHERE agent_class = 'lead' LIMIT 1) AS lead_name,
+                a.name AS sender, a.agent_class, a.context_updated_at_epoch, a.transport
+            FROM (SELECT 1)
+            LEFT JOIN agents a ON a.name = ?
             """,
-            (from_agent, from_agent),
+            (from_agent, from_agent, from_agent, from_agent),
         )
-        unread_broadcast = cursor.fetchone()[0]
+        gate = cursor.fetchone()
 
-        unread = unread_direct + unread_broadcast
+        # --- inbox discipline: must read before sending ---
+        unread = gate["unread_direct"] + gate["unread_broadcast"]
         if unread > 0:
             return (
                 f"BLOCKED: You have {unread} unread message(s). "
@@ -655,55 +987,58 @@ def send(
             )
 
         # --- battle plan enforcement: lead must set a plan before comms flow ---
-        cursor.execute(
-            "SELECT COUNT(*) FROM battle_plan WHERE status = 'active'"
-        )
-        if cursor.fetchone()[0] == 0:
+        if not gate["has_plan"]:
             return (
                 "BLOCKED: No active battle plan. "
                 "Lead must call set_battle_plan before comms can flow."
             )
 
         # --- context freshness: class-based staleness enforcement ---
-        is_stale, stale_msg = _staleness_check(cursor, from_agent)
-        if is_stale:
-            return stale_msg
-
-        # Auto-register senders we haven't seen (shouldn't happen, but safe fallback)
-        cursor.execute(
-            "INSERT OR IGNORE INTO agents (name, agent_class, registered_at, last_seen) VALUES (?, 'coder', ?, ?)",
+        if gate["sender"] is not None:
+            is_stale, stale_msg = _staleness_verdict(gate["agent_class"], gate["context_updated_at_epoch"])
+            if is_stale:
+                return stale_msg
+
+        # Update sender's last_seen, auto-registering senders we haven't seen
+        # (shouldn't happen, but safe fallback)
+        cursor.execute(
+            """INSERT INTO agents (name, agent_class, registered_at, last_seen, last_seen_epoch)
+               VALUES (?, 'coder', ?, ?, strftime('%s', 'now'))
+               ON CONFLICT(name) DO UPDATE SET
+                   last_seen = excluded.last_seen,
+                   last_seen_epoch = excluded.last_seen_epoch""",
             (from_agent, now, now),
         )
 
-        # Insert primary message
+        # Insert primary message (large bodies compressed once, shared by CC copies)
+        content, content_z = _pack_content(message)
         cursor.execute(
-            "INSERT INTO messages (from_agent, to_agent, content, timestamp, read_flag, is_cc) VALUES (?, ?, ?, ?, 0, 0)",
-            (from_agent, to_agent, message, now),
+            "INSERT INTO messages (from_agent, to_agent, content, content_z, timestamp, ts_epoch, read_flag, is_cc) "
+            "VALUES (?, ?, ?, ?, ?, strftime('%s', 'now'), 0, 0)",
+            (from_agent, to_agent, content, content_z, now),
         )
 
         # Build CC list: explicit + auto-CC lead
         cc_agents = [a.strip() for a in cc.split(",") if a.strip()] if cc else []
 
-        lead_name = _get_lead(cursor)
+        lead_name = gate["lead_name"]
         if lead_name and from_agent != lead_name and to_agent != lead_name and lead_name not in cc_agents:
             cc_agents.append(lead_name)
 
-        for cc_agent in cc_agents:
-            if cc_agent != to_agent:  # don't double-deliver
-                cursor.execute(
-                    """INSERT INTO messages
-                       (from_agent, to_agent, content, timestamp, read_flag, is_cc, cc_original_to)
-                       VALUES (?, ?, ?, ?, 0, 1, ?)""",
-                    (from_agent, cc_agent, message, now, to_agent),
-                )
-
-        # Update sender's last_seen
-        cursor.execute("UPDATE agents SET last_seen = ? WHERE name = ?", (now, from_agent))
+        cc_rows = [
+            (from_agent, cc_agent, content, content_z, now, to_agent)
+            for cc_agent in cc_agents
+            if cc_agent != to_agent  # don't double-deliver
+        ]
+        cursor.executemany(
+            """INSERT INTO messages
+               (from_agent, to_agent, content, content_z, timestamp, ts_epoch, read_flag, is_cc, cc_original_to)
+               VALUES (?, ?, ?, ?, ?, strftime('%s', 'now'), 0, 1, ?)""",
+            cc_rows,
+        )
 
-        # Check sender's transport for poll.sh reminder
-        cursor.execute("SELECT transport FROM agents WHERE name = ?", (from_agent,))
-        sender_row = cursor.fetchone()
-        sender_transport = sender_row["transport"] if sender_row else "terminal"
+        # Sender's transport for poll.sh reminder (auto-registered senders default to terminal)
+        sender_transport = gate["transport"] if gate["sender"] is not None else "terminal"
 
         # --- Phase 7: trigger word detection (after message is stored) ---
         triggers_found = _scan_triggers(message)
@@ -745,7 +1080,7 @@ def send(
     except Exception as e:
         return f"Error sending message: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 @mcp.tool()
@@ -756,45 +1091,53 @@ def check_inbox(agent_name: str) -> str:
     """
     conn = get_db()
     cursor = conn.cursor()
-    now = datetime.datetime.now().isoformat()
+    now = _now_iso()
     try:
+        cursor.execute("BEGIN IMMEDIATE")
+
         # Update last_seen and last_inbox_check
         cursor.execute(
-            "UPDATE agents SET last_seen = ?, last_inbox_check = ? WHERE name = ?",
+            "UPDATE agents SET last_seen = ?, last_seen_epoch = strftime('%s', 'now'), last_inbox_check = ? WHERE name = ?",
             (now, now, agent_name),
         )
 
-        # Get unread direct messages
+        # Mark unread direct messages as read and read them back in one statement.
+        # read_flag is reported as it was before the update; RETURNING order is
+        # unspecified, so restore id order below.
         cursor.execute(
-            "SELECT * FROM messages WHERE to_agent = ? AND read_flag = 0",
+            """UPDATE messages SET read_flag = 1 WHERE to_agent = ? AND read_flag = 0
+               RETURNING id, from_agent, to_agent, content, timestamp, 0 AS read_flag,
+                         is_cc, cc_original_to, content_z, ts_epoch""",
             (agent_name,),
         )
-        direct_msgs = [dict(row) for row in cursor.fetchall()]
-
-        # Mark direct messages as read
-        if direct_msgs:
-            ids = [m["id"] for m in direct_msgs]
-            cursor.execute(
-                f"UPDATE messages SET read_flag = 1 WHERE id IN ({','.join(['?']*len(ids))})",
-                ids,
-            )
+        direct_msgs = _unpack_messages(_dicts(cursor))
+        direct_msgs.sort(key=lambda m: m["id"])
 
-        # Get unread broadcasts
+        # Get unread broadcasts (only ids above the agent's highwater can be unread)
+        cursor.execute(
+            "SELECT COALESCE(MAX(broadcast_highwater), 0) FROM agents WHERE name = ?",
+            (agent_name,),
+        )
+        highwater = cursor.fetchone()[0]
         cursor.execute(
             """
-            SELECT * FROM messages
-            WHERE to_agent = 'all'
-            AND id NOT IN (SELECT message_id FROM broadcast_reads WHERE agent_name = ?)
+            SELECT m.* FROM messages m
+            LEFT JOIN broadcast_reads b ON b.message_id = m.id AND b.agent_name = ?
+            WHERE m.id > ? AND m.to_agent = 'all' AND b.message_id IS NULL
             """,
-            (agent_name,),
+            (agent_name, highwater),
         )
-        broadcast_msgs = [dict(row) for row in cursor.fetchall()]
+        broadcast_msgs = _unpack_messages(_dicts(cursor))
 
-        # Mark broadcasts as read
-        for msg in broadcast_msgs:
-            cursor.execute(
+        # Mark broadcasts as read; all broadcasts are now read, so raise the highwater
+        if broadcast_msgs:
+            cursor.executemany(
                 "INSERT OR IGNORE INTO broadcast_reads (agent_name, message_id) VALUES (?, ?)",
-                (agent_name, msg["id"]),
+                [(agent_name, m["id"]) for m in broadcast_msgs],
+            )
+            cursor.execute(
+                "UPDATE agents SET broadcast_highwater = ? WHERE name = ?",
+                (max(m["id"] for m in broadcast_msgs), agent_name),
             )
 
         conn.commit()
@@ -815,7 +1158,7 @@ def check_inbox(agent_name: str) -> str:
                 + " Call set_context to update your metrics."
             )
 
-        result = json.dumps(all_messages, indent=2)
+        result = _dumps(all_messages)
         result += (
             "\n\nREMINDER: If you haven't already this session, re-read PROTOCOL.md "
             "and your class profile before starting work."
@@ -827,26 +1170,27 @@ def check_inbox(agent_name: str) -> str:
     except Exception as e:
         return f"Error checking inbox: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 @mcp.tool()
 def get_history(count: int = 20) -> str:
     """Return the last N messages across all agents (oldest to newest).
     Use after compaction to catch up on recent comms."""
-    conn = get_db()
+    conn = get_read_db()
     cursor = conn.cursor()
     try:
         cursor.execute(
-            "SELECT * FROM messages ORDER BY timestamp DESC LIMIT ?",
+            "SELECT * FROM messages ORDER BY id DESC LIMIT ?",
             (count,),
         )
-        msgs = [dict(row) for row in cursor.fetchall()]
-        return json.dumps(msgs[::-1], indent=2)
+        msgs = _unpack_messages(_dicts(cursor))
+        msgs.reverse()  # oldest to newest, in place
+        return _dumps(msgs)
     except Exception as e:
         return f"Error fetching history: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 @mcp.tool()
@@ -855,30 +1199,35 @@ def purge_inbox(agent_name: str, older_than_hours: int = 2) -> str:
     Protects recent unread messages. Use to clear stale messages from dead sessions."""
     conn = get_db()
     cursor = conn.cursor()
-    cutoff = (datetime.datetime.now() - datetime.timedelta(hours=older_than_hours)).isoformat()
+    cutoff_epoch = int(time.time()) - older_than_hours * 3600
     try:
+        cursor.execute("BEGIN IMMEDIATE")
         cursor.execute(
-            "DELETE FROM messages WHERE to_agent = ? AND timestamp < ?",
-            (agent_name, cutoff),
+            "DELETE FROM messages WHERE to_agent = ? AND ts_epoch <= ?",
+            (agent_name, cutoff_epoch),
         )
         deleted = cursor.rowcount
 
         # Mark old broadcasts as read so they don't block sends
+        # (those at or below the agent's highwater are already read)
         cursor.execute(
             """
             INSERT OR IGNORE INTO broadcast_reads (agent_name, message_id)
-            SELECT ?, id FROM messages WHERE to_agent = 'all' AND timestamp < ?
+            SELECT ?, id FROM messages
+            WHERE to_agent = 'all' AND ts_epoch <= ?
+            AND id > COALESCE((SELECT broadcast_highwater FROM agents WHERE name = ?), 0)
             """,
-            (agent_name, cutoff),
+            (agent_name, cutoff_epoch, agent_name),
         )
         dismissed = cursor.rowcount
 
-        # Clean up dangling broadcast_reads for deleted messages
+        # Clean up dangling broadcast_reads for deleted messages — a rowid probe
+        # per read row, not a materialized list of every message id
         cursor.execute(
             """
             DELETE FROM broadcast_reads
             WHERE agent_name = ?
-            AND message_id NOT IN (SELECT id FROM messages)
+            AND NOT EXISTS (SELECT 1 FROM messages m WHERE m.id = broadcast_reads.message_id)
             """,
             (agent_name,),
         )
@@ -891,7 +1240,7 @@ def purge_inbox(agent_name: str, older_than_hours: int = 2) -> str:
     except Exception as e:
         return f"Error purging inbox: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 # ---------------------------------------------------------------------------
@@ -911,12 +1260,11 @@ def set_battle_plan(agent_name: str, plan: str) -> str:
     """
     conn = get_db()
     cursor = conn.cursor()
-    now = datetime.datetime.now().isoformat()
+    now = _now_iso()
     try:
+        cursor.execute("BEGIN IMMEDIATE")
         # Lead-only enforcement
-        cursor.execute(
-            "SELECT agent_class FROM agents WHERE name = ?", (agent_name,)
-        )
+        cursor.execute(_AGENT_CLASS_SQL, (agent_name,))
         row = cursor.fetchone()
         if not row:
             return f"BLOCKED: Agent '{agent_name}' not registered."
@@ -945,7 +1293,7 @@ def set_battle_plan(agent_name: str, plan: str) -> str:
     except Exception as e:
         return f"Error setting battle plan: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 @mcp.tool()
@@ -958,24 +1306,24 @@ def get_battle_plan(status: str = "active") -> str:
     if status not in BATTLE_PLAN_STATUSES:
         return (
             f"Invalid status '{status}'. "
-            f"Valid: {', '.join(sorted(BATTLE_PLAN_STATUSES))}"
+            f"Valid: {_BATTLE_PLAN_STATUSES_TEXT}"
         )
 
-    conn = get_db()
+    conn = get_read_db()
     cursor = conn.cursor()
     try:
         cursor.execute(
             "SELECT * FROM battle_plan WHERE status = ? ORDER BY created_at DESC",
             (status,),
         )
-        plans = [dict(row) for row in cursor.fetchall()]
+        plans = _dicts(cursor)
         if not plans:
             return f"No battle plans with status '{status}'."
-        return json.dumps(plans, indent=2)
+        return _dumps(plans)
     except Exception as e:
         return f"Error getting battle plan: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 @mcp.tool()
@@ -991,17 +1339,16 @@ def update_battle_plan_status(agent_name: str, plan_id: int, status: str) -> str
     if status not in BATTLE_PLAN_STATUSES:
         return (
             f"Invalid status '{status}'. "
-            f"Valid: {', '.join(sorted(BATTLE_PLAN_STATUSES))}"
+            f"Valid: {_BATTLE_PLAN_STATUSES_TEXT}"
         )
 
     conn = get_db()
     cursor = conn.cursor()
-    now = datetime.datetime.now().isoformat()
+    now = _now_iso()
     try:
+        cursor.execute("BEGIN IMMEDIATE")
         # Lead-only enforcement
-        cursor.execute(
-            "SELECT agent_class FROM agents WHERE name = ?", (agent_name,)
-        )
+        cursor.execute(_AGENT_CLASS_SQL, (agent_name,))
         row = cursor.fetchone()
         if not row:
             return f"BLOCKED: Agent '{agent_name}' not registered."
@@ -1029,7 +1376,7 @@ def update_battle_plan_status(agent_name: str, plan_id: int, status: str) -> str
     except Exception as e:
         return f"Error updating battle plan status: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 @mcp.tool()
@@ -1046,16 +1393,16 @@ def log_raid(agent_name: str, entry: str, priority: str = "normal") -> str:
     if priority not in RAID_LOG_PRIORITIES:
         return (
             f"Invalid priority '{priority}'. "
-            f"Valid: {', '.join(sorted(RAID_LOG_PRIORITIES))}"
+            f"Valid: {_RAID_LOG_PRIORITIES_TEXT}"
         )
 
     conn = get_db()
     cursor = conn.cursor()
-    now = datetime.datetime.now().isoformat()
+    now = _now_iso()
     try:
-        # Verify agent exists
-        cursor.execute("SELECT name FROM agents WHERE name = ?", (agent_name,))
-        if not cursor.fetchone():
+        cursor.execute("BEGIN IMMEDIATE")
+        # Verify agent exists; heartbeat is throttled by _touch_agent
+        if _touch_agent(cursor, agent_name, now) is None:
             return f"BLOCKED: Agent '{agent_name}' not registered."
 
         cursor.execute(
@@ -1065,17 +1412,66 @@ def log_raid(agent_name: str, entry: str, priority: str = "normal") -> str:
         )
         log_id = cursor.lastrowid
 
-        # Update last_seen
-        cursor.execute(
-            "UPDATE agents SET last_seen = ? WHERE name = ?", (now, agent_name)
+        conn.commit()
+        return f"Raid log #{log_id} by {agent_name} [{priority}]: {_preview(entry)}"
+    except Exception as e:
+        return f"Error logging to raid log: {e}"
+    finally:
+        conn.rollback()
+
+
+@mcp.tool()
+def log_raid_batch(agent_name: str, entries: str, priority: str = "normal") -> str:
+    """Append several entries to the raid log in one transaction. Any agent can write.
+
+    Use instead of repeated log_raid calls when recording a burst of findings.
+
+    agent_name: who is logging.
+    entries: JSON list of entry strings, e.g. '["found X", "ruled out Y"]'.
+    priority: low | normal | high | critical (applies to every entry).
+    """
+    if priority not in RAID_LOG_PRIORITIES:
+        return (
+            f"Invalid priority '{priority}'. "
+            f"Valid: {_RAID_LOG_PRIORITIES_TEXT}"
+        )
+    try:
+        entry_list = json.loads(entries)
+    except ValueError:
+        entry_list = None
+    if not isinstance(entry_list, list) or not all(isinstance(e, str) for e in entry_list):
+        return "Invalid entries. Must be a JSON list of strings."
+    if not entry_list:
+        return "No entries to log."
+
+    conn = get_db()
+    cursor = conn.cursor()
+    now = _now_iso()
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        # Verify agent exists; heartbeat is throttled by _touch_agent
+        if _touch_agent(cursor, agent_name, now) is None:
+            return f"BLOCKED: Agent '{agent_name}' not registered."
+
+        cursor.executemany(
+            """INSERT INTO raid_log (agent_name, entry, priority, created_at)
+               VALUES (?, ?, ?, ?)""",
+            [(agent_name, entry, priority, now) for entry in entry_list],
         )
+        # The write lock is held, so the batch's ids are consecutive
+        cursor.execute("SELECT last_insert_rowid()")
+        last_id = cursor.fetchone()[0]
+        first_id = last_id - len(entry_list) + 1
 
         conn.commit()
-        return f"Raid log #{log_id} by {agent_name} [{priority}]: {entry[:80]}{'...' if len(entry) > 80 else ''}"
+        return (
+            f"Raid log #{first_id}-#{last_id} by {agent_name} [{priority}]: "
+            f"{len(entry_list)} entries"
+        )
     except Exception as e:
         return f"Error logging to raid log: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 @mcp.tool()
@@ -1083,6 +1479,7 @@ def get_raid_log(
     priority: str = "",
     count: int = 20,
     agent_name: str = "",
+    format: str = "json",
 ) -> str:
     """Read the raid log. Supports filtering by priority and agent.
 
@@ -1090,32 +1487,44 @@ def get_raid_log(
               Empty string = all priorities.
     count: max entries to return (default 20, newest first).
     agent_name: filter to entries from a specific agent. Empty = all agents.
+    format: 'json' (full entries), 'ids' (JSON list of entry ids), or
+            'count' (number of matching entries; ignores count).
     """
     if priority and priority not in RAID_LOG_PRIORITIES:
         return (
             f"Invalid priority '{priority}'. "
-            f"Valid: {', '.join(sorted(RAID_LOG_PRIORITIES))}"
+            f"Valid: {_RAID_LOG_PRIORITIES_TEXT}"
         )
+    if format not in LIST_FORMATS:
+        return f"Invalid format '{format}'. Valid: {_LIST_FORMATS_TEXT}"
 
-    conn = get_db()
+    conn = get_read_db()
     cursor = conn.cursor()
     try:
-        query = "SELECT * FROM raid_log WHERE 1=1"
+        where = " WHERE 1=1"
         params: list[str | int] = []
 
         if priority:
-            query += " AND priority = ?"
+            where += " AND priority = ?"
             params.append(priority)
 
         if agent_name:
-            query += " AND agent_name = ?"
+            where += " AND agent_name = ?"
             params.append(agent_name)
 
-        query += " ORDER BY created_at DESC LIMIT ?"
-        params.append(count)
+        if format == "count":
+            cursor.execute("SELECT COUNT(*) FROM raid_log" + where, params)
+            return str(cursor.fetchone()[0])
 
-        cursor.execute(query, params)
-        entries = [dict(row) for row in cursor.fetchall()]
+        columns = "id" if format == "ids" else "*"
+        params.append(count)
+        cursor.execute(
+            f"SELECT {columns} FROM raid_log{where} ORDER BY created_at DESC LIMIT ?",
+            params,
+        )
+        if format == "ids":
+            return json.dumps([row[0] for row in cursor.fetchall()])
+        entries = _dicts(cursor)
 
         if not entries:
             filter_desc = []
@@ -1127,11 +1536,11 @@ def get_raid_log(
             return f"No raid log entries{desc}."
 
         # Return newest-first (already sorted by query)
-        return json.dumps(entries, indent=2)
+        return _dumps(entries)
     except Exception as e:
         return f"Error reading raid log: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 # ---------------------------------------------------------------------------
@@ -1156,16 +1565,24 @@ def create_task(
     zone: which zone this task targets (optional).
     blocked_by: comma-separated task IDs that block this task (optional).
     """
+    # Stat the file before taking the write lock; the verdict is applied below
+    # in its usual order among the other checks.
+    task_file_exists = os.path.exists(task_file)
+
     conn = get_db()
     cursor = conn.cursor()
-    now = datetime.datetime.now().isoformat()
+    now = _now_iso()
     try:
-        # Lead-only enforcement
+        cursor.execute("BEGIN IMMEDIATE")
+        # Lead-only enforcement and active battle plan, in one round trip
         cursor.execute(
-            "SELECT agent_class FROM agents WHERE name = ?", (agent_name,)
+            """SELECT a.name, a.agent_class,
+                      EXISTS (SELECT 1 FROM battle_plan WHERE status = 'active') AS has_plan
+               FROM (SELECT 1) LEFT JOIN agents a ON a.name = ?""",
+            (agent_name,),
         )
         row = cursor.fetchone()
-        if not row:
+        if row["name"] is None:
             return f"BLOCKED: Agent '{agent_name}' not registered."
         if row["agent_class"] != "lead":
             return (
@@ -1174,17 +1591,14 @@ def create_task(
             )
 
         # Active battle plan required
-        cursor.execute(
-            "SELECT COUNT(*) FROM battle_plan WHERE status = 'active'"
-        )
-        if cursor.fetchone()[0] == 0:
+        if not row["has_plan"]:
             return (
                 "BLOCKED: No active battle plan. "
                 "Lead must call set_battle_plan before creating tasks."
             )
 
         # task_file must exist on disk
-        if not os.path.exists(task_file):
+        if not task_file_exists:
             return f"BLOCKED: Task file does not exist: {task_file}"
 
         # Validate blocked_by task IDs
@@ -1195,13 +1609,26 @@ def create_task(
                 if not raw_id:
                     continue
                 try:
-                    tid = int(raw_id)
+                    blocker_ids.append(int(raw_id))
                 except ValueError:
                     return f"BLOCKED: Invalid task ID in blocked_by: '{raw_id}'. Must be integers."
-                cursor.execute("SELECT id FROM tasks WHERE id = ?", (tid,))
-                if not cursor.fetchone():
-                    return f"BLOCKED: blocked_by task #{tid} does not exist."
-                blocker_ids.append(tid)
+        if blocker_ids:
+            # One lookup for all blockers; report every missing one at once.
+            # The ids go in as one JSON array so the SQL text (and its cached
+            # prepared statement) is the same whatever the blocker count.
+            cursor.execute(
+                "SELECT id FROM tasks WHERE id IN (SELECT value FROM json_each(?))",
+                (json.dumps(blocker_ids),),
+            )
+            existing = {r["id"] for r in cursor.fetchall()}
+            missing = [tid for tid in dict.fromkeys(blocker_ids) if tid not in existing]
+            if len(missing) == 1:
+                return f"BLOCKED: blocked_by task #{missing[0]} does not exist."
+            if missing:
+                return (
+                    f"BLOCKED: blocked_by tasks {', '.join(f'#{tid}' for tid in missing)} "
+                    f"do not exist."
+                )
 
         blocked_by_str = ",".join(str(i) for i in blocker_ids) if blocker_ids else None
 
@@ -1229,7 +1656,7 @@ def create_task(
     except Exception as e:
         return f"Error creating task: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 @mcp.tool()
@@ -1242,56 +1669,60 @@ def assign_task(agent_name: str, task_id: int, assigned_to: str) -> str:
     """
     conn = get_db()
     cursor = conn.cursor()
-    now = datetime.datetime.now().isoformat()
+    now = _now_iso()
     try:
-        # Phase 7: moon_crash blocks all new task assignments
-        cursor.execute(
-            "SELECT value, set_by, set_at FROM flags WHERE key = 'moon_crash'"
-        )
-        mc_row = cursor.fetchone()
-        if mc_row and mc_row["value"] == "1":
-            return (
-                "BLOCKED: moon_crash active — emergency shutdown, no new assignments. "
-                f"(set by {mc_row['set_by']} at {mc_row['set_at']})"
-            )
+        cursor.execute("BEGIN IMMEDIATE")
 
-        # Lead-only enforcement
+        # Happy path: every precondition rides along in the UPDATE's WHERE clause
         cursor.execute(
-            "SELECT agent_class FROM agents WHERE name = ?", (agent_name,)
+            """UPDATE tasks SET assigned_to = ?, status = 'assigned', updated_at = ?
+               WHERE id = ? AND status != 'closed'
+               AND NOT EXISTS (SELECT 1 FROM flags WHERE key = 'moon_crash' AND value = '1')
+               AND EXISTS (SELECT 1 FROM agents WHERE name = ? AND agent_class = 'lead')
+               AND EXISTS (SELECT 1 FROM agents WHERE name = ?)""",
+            (assigned_to, now, task_id, agent_name, assigned_to),
         )
-        row = cursor.fetchone()
-        if not row:
-            return f"BLOCKED: Agent '{agent_name}' not registered."
-        if row["agent_class"] != "lead":
-            return (
-                f"BLOCKED: Only lead-class agents can assign tasks. "
-                f"'{agent_name}' is class '{row['agent_class']}'."
+        if cursor.rowcount == 0:
+            # Nothing assigned — walk the checks in order to report which one failed
+
+            # Phase 7: moon_crash blocks all new task assignments
+            cursor.execute(
+                "SELECT value, set_by, set_at FROM flags WHERE key = 'moon_crash'"
             )
+            mc_row = cursor.fetchone()
+            if mc_row and mc_row["value"] == "1":
+                return (
+                    "BLOCKED: moon_crash active — emergency shutdown, no new assignments. "
+                    f"(set by {mc_row['set_by']} at {mc_row['set_at']})"
+                )
 
-        # Verify assignee exists
-        cursor.execute("SELECT name FROM agents WHERE name = ?", (assigned_to,))
-        if not cursor.fetchone():
-            return f"BLOCKED: Agent '{assigned_to}' not registered."
+            # Lead-only enforcement
+            cursor.execute(_AGENT_CLASS_SQL, (agent_name,))
+            row = cursor.fetchone()
+            if not row:
+                return f"BLOCKED: Agent '{agent_name}' not registered."
+            if row["agent_class"] != "lead":
+                return (
+                    f"BLOCKED: Only lead-class agents can assign tasks. "
+                    f"'{agent_name}' is class '{row['agent_class']}'."
+                )
 
-        # Verify task exists
-        cursor.execute("SELECT id, status FROM tasks WHERE id = ?", (task_id,))
-        task_row = cursor.fetchone()
-        if not task_row:
-            return f"Task #{task_id} not found."
+            # Verify assignee exists
+            cursor.execute(_AGENT_EXISTS_SQL, (assigned_to,))
+            if not cursor.fetchone():
+                return f"BLOCKED: Agent '{assigned_to}' not registered."
 
-        if task_row["status"] == "closed":
+            cursor.execute(_TASK_EXISTS_SQL, (task_id,))
+            if not cursor.fetchone():
+                return f"Task #{task_id} not found."
             return f"BLOCKED: Task #{task_id} is closed."
 
-        cursor.execute(
-            "UPDATE tasks SET assigned_to = ?, status = 'assigned', updated_at = ? WHERE id = ?",
-            (assigned_to, now, task_id),
-        )
         conn.commit()
         return f"Task #{task_id} assigned to {assigned_to}. Status: assigned."
     except Exception as e:
         return f"Error assigning task: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 @mcp.tool()
@@ -1313,7 +1744,7 @@ def update_task(
     if status and status not in TASK_STATUSES:
         return (
             f"Invalid status '{status}'. "
-            f"Valid: {', '.join(sorted(TASK_STATUSES))}"
+            f"Valid: {_TASK_STATUSES_TEXT}"
         )
 
     if status == "closed":
@@ -1321,25 +1752,14 @@ def update_task(
 
     conn = get_db()
     cursor = conn.cursor()
-    now = datetime.datetime.now().isoformat()
+    now = _now_iso()
     try:
-        # Verify agent exists
-        cursor.execute("SELECT name FROM agents WHERE name = ?", (agent_name,))
-        if not cursor.fetchone():
+        cursor.execute("BEGIN IMMEDIATE")
+        # Verify agent exists; heartbeat is throttled by _touch_agent
+        agent_row = _touch_agent(cursor, agent_name, now)
+        if agent_row is None:
             return f"BLOCKED: Agent '{agent_name}' not registered."
 
-        # Verify task exists
-        cursor.execute(
-            "SELECT id, status, activity_count, title FROM tasks WHERE id = ?",
-            (task_id,),
-        )
-        task_row = cursor.fetchone()
-        if not task_row:
-            return f"Task #{task_id} not found."
-
-        if task_row["status"] == "closed":
-            return f"BLOCKED: Task #{task_id} is closed. No further updates allowed."
-
         # Build dynamic UPDATE
         fields = ["activity_count = activity_count + 1", "updated_at = ?"]
         params: list[str | int] = [now]
@@ -1356,20 +1776,21 @@ def update_task(
             fields.append("files = ?")
             params.append(files)
 
+        # Update only open tasks and read back activity_count in one statement
         params.append(task_id)
         cursor.execute(
-            f"UPDATE tasks SET {', '.join(fields)} WHERE id = ?",
+            f"UPDATE tasks SET {', '.join(fields)} WHERE id = ? AND status != 'closed' "
+            f"RETURNING activity_count",
             params,
         )
-
-        # Read back activity_count
-        cursor.execute("SELECT activity_count FROM tasks WHERE id = ?", (task_id,))
-        new_count = cursor.fetchone()["activity_count"]
-
-        # Update agent last_seen
-        cursor.execute(
-            "UPDATE agents SET last_seen = ? WHERE name = ?", (now, agent_name)
-        )
+        task_row = cursor.fetchone()
+        if task_row is None:
+            # Nothing updated — tell "missing" apart from "closed"
+            cursor.execute(_TASK_EXISTS_SQL, (task_id,))
+            if not cursor.fetchone():
+                return f"Task #{task_id} not found."
+            return f"BLOCKED: Task #{task_id} is closed. No further updates allowed."
+        new_count = task_row["activity_count"]
 
         conn.commit()
 
@@ -1377,7 +1798,7 @@ def update_task(
         if status:
             parts.append(f"Status: {status}.")
         if progress:
-            parts.append(f"Progress: {progress[:80]}{'...' if len(progress) > 80 else ''}")
+            parts.append(f"Progress: {_preview(progress)}")
         parts.append(f"Activity count: {new_count}.")
 
         if new_count >= 4:
@@ -1387,7 +1808,7 @@ def update_task(
             )
 
         # Phase 5: staleness nag (warn but don't block — send() blocks)
-        _, stale_msg = _staleness_check(cursor, agent_name)
+        _, stale_msg = _staleness_verdict(agent_row["agent_class"], agent_row["context_updated_at_epoch"])
         if stale_msg:
             parts.append(
                 "WARNING: " + stale_msg.replace("BLOCKED: ", "")
@@ -1398,7 +1819,7 @@ def update_task(
     except Exception as e:
         return f"Error updating task: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 @mcp.tool()
@@ -1408,6 +1829,7 @@ def get_tasks(
     zone: str = "",
     assigned_to: str = "",
     count: int = 50,
+    format: str = "json",
 ) -> str:
     """List tasks. Defaults to open/assigned/in_progress if no status filter given.
 
@@ -1416,43 +1838,59 @@ def get_tasks(
     zone: filter by zone.
     assigned_to: filter by assigned agent.
     count: max tasks to return (default 50).
+    format: 'json' (full tasks), 'ids' (JSON list of task ids), or
+            'count' (number of matching tasks; ignores count).
     """
     if status and status not in TASK_STATUSES:
         return (
             f"Invalid status '{status}'. "
-            f"Valid: {', '.join(sorted(TASK_STATUSES))}"
+            f"Valid: {_TASK_STATUSES_TEXT}"
         )
+    if format not in LIST_FORMATS:
+        return f"Invalid format '{format}'. Valid: {_LIST_FORMATS_TEXT}"
 
-    conn = get_db()
+    conn = get_read_db()
     cursor = conn.cursor()
     try:
-        query = "SELECT * FROM tasks WHERE 1=1"
+        source = "tasks"
+        where = " WHERE 1=1"
         params: list[str | int] = []
 
         if status:
-            query += " AND status = ?"
+            where += " AND status = ?"
             params.append(status)
         else:
-            # Default: active tasks only
-            query += " AND status IN ('open', 'assigned', 'in_progress')"
+            # Default: active tasks only. Without sqlite_stat1 rows the planner
+            # prefers idx_tasks_status_created plus a sort, so name the partial
+            # index outright: newest-first walk, stops at the LIMIT.
+            source = "tasks INDEXED BY idx_tasks_active"
+            where += " AND status IN ('open', 'assigned', 'in_progress')"
 
         if project:
-            query += " AND project = ?"
+            where += " AND project = ?"
             params.append(project)
 
         if zone:
-            query += " AND zone = ?"
+            where += " AND zone = ?"
             params.append(zone)
 
         if assigned_to:
-            query += " AND assigned_to = ?"
+            where += " AND assigned_to = ?"
             params.append(assigned_to)
 
-        query += " ORDER BY created_at DESC LIMIT ?"
-        params.append(count)
+        if format == "count":
+            cursor.execute(f"SELECT COUNT(*) FROM {source}{where}", params)
+            return str(cursor.fetchone()[0])
 
-        cursor.execute(query, params)
-        tasks = [dict(row) for row in cursor.fetchall()]
+        columns = "id" if format == "ids" else "*"
+        params.append(count)
+        cursor.execute(
+            f"SELECT {columns} FROM {source}{where} ORDER BY created_at DESC LIMIT ?",
+            params,
+        )
+        if format == "ids":
+            return json.dumps([row[0] for row in cursor.fetchall()])
+        tasks = _dicts(cursor)
 
         if not tasks:
             filter_desc = []
@@ -1469,11 +1907,11 @@ def get_tasks(
             desc = f" ({', '.join(filter_desc)})" if filter_desc else ""
             return f"No tasks found{desc}."
 
-        return json.dumps(tasks, indent=2)
+        return _dumps(tasks)
     except Exception as e:
         return f"Error listing tasks: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 @mcp.tool()
@@ -1482,18 +1920,18 @@ def get_task(task_id: int) -> str:
 
     task_id: the task ID.
     """
-    conn = get_db()
+    conn = get_read_db()
     cursor = conn.cursor()
     try:
         cursor.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
         row = cursor.fetchone()
         if not row:
             return f"Task #{task_id} not found."
-        return json.dumps(dict(row), indent=2)
+        return _dumps(dict(row))
     except Exception as e:
         return f"Error getting task: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 @mcp.tool()
@@ -1504,43 +1942,40 @@ def submit_result(agent_name: str, task_id: int, result_file: str) -> str:
     task_id: the task this result belongs to.
     result_file: path to the result/writeup file (must exist).
     """
+    # Stat outside the write transaction, as in create_task
+    result_file_exists = os.path.exists(result_file)
+
     conn = get_db()
     cursor = conn.cursor()
-    now = datetime.datetime.now().isoformat()
+    now = _now_iso()
     try:
-        # Verify agent exists
-        cursor.execute("SELECT name FROM agents WHERE name = ?", (agent_name,))
-        if not cursor.fetchone():
+        cursor.execute("BEGIN IMMEDIATE")
+        # Verify agent exists; heartbeat is throttled by _touch_agent
+        if _touch_agent(cursor, agent_name, now) is None:
             return f"BLOCKED: Agent '{agent_name}' not registered."
 
-        # Verify task exists
-        cursor.execute(
-            "SELECT id, status, title FROM tasks WHERE id = ?", (task_id,)
-        )
-        task_row = cursor.fetchone()
-        if not task_row:
-            return f"Task #{task_id} not found."
-
-        # Result file must exist on disk
-        if not os.path.exists(result_file):
+        if result_file_exists:
+            # The UPDATE doubles as the task existence check
+            cursor.execute(
+                "UPDATE tasks SET result_file = ?, updated_at = ? WHERE id = ?",
+                (result_file, now, task_id),
+            )
+            if cursor.rowcount == 0:
+                return f"Task #{task_id} not found."
+        else:
+            # Verify task exists before reporting the missing file
+            cursor.execute(_TASK_EXISTS_SQL, (task_id,))
+            if not cursor.fetchone():
+                return f"Task #{task_id} not found."
+            # Result file must exist on disk
             return f"BLOCKED: Result file does not exist: {result_file}"
 
-        cursor.execute(
-            "UPDATE tasks SET result_file = ?, updated_at = ? WHERE id = ?",
-            (result_file, now, task_id),
-        )
-
-        # Update agent last_seen
-        cursor.execute(
-            "UPDATE agents SET last_seen = ? WHERE name = ?", (now, agent_name)
-        )
-
         conn.commit()
         return f"Result submitted for task #{task_id}: {result_file}"
     except Exception as e:
         return f"Error submitting result: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 @mcp.tool()
@@ -1552,50 +1987,50 @@ def close_task(agent_name: str, task_id: int) -> str:
     """
     conn = get_db()
     cursor = conn.cursor()
-    now = datetime.datetime.now().isoformat()
+    now = _now_iso()
     try:
-        # Lead-only enforcement
-        cursor.execute(
-            "SELECT agent_class FROM agents WHERE name = ?", (agent_name,)
-        )
-        row = cursor.fetchone()
-        if not row:
-            return f"BLOCKED: Agent '{agent_name}' not registered."
-        if row["agent_class"] != "lead":
-            return (
-                f"BLOCKED: Only lead-class agents can close tasks. "
-                f"'{agent_name}' is class '{row['agent_class']}'."
-            )
-
-        # Verify task exists
-        cursor.execute(
-            "SELECT id, status, result_file, title FROM tasks WHERE id = ?",
-            (task_id,),
-        )
-        task_row = cursor.fetchone()
-        if not task_row:
-            return f"Task #{task_id} not found."
-
-        if task_row["status"] == "closed":
-            return f"Task #{task_id} is already closed."
+        cursor.execute("BEGIN IMMEDIATE")
+        # Close only an open task with a result file, by a lead; read back the title
+        cursor.execute(
+            """UPDATE tasks SET status = 'closed', updated_at = ?
+               WHERE id = ? AND status != 'closed' AND COALESCE(result_file, '') != ''
+               AND EXISTS (SELECT 1 FROM agents WHERE name = ? AND agent_class = 'lead')
+               RETURNING title""",
+            (now, task_id, agent_name),
+        )
+        closed_row = cursor.fetchone()
+        if closed_row is None:
+            # Nothing closed — report which precondition failed
+            # Lead-only enforcement
+            cursor.execute(_AGENT_CLASS_SQL, (agent_name,))
+            row = cursor.fetchone()
+            if not row:
+                return f"BLOCKED: Agent '{agent_name}' not registered."
+            if row["agent_class"] != "lead":
+                return (
+                    f"BLOCKED: Only lead-class agents can close tasks. "
+                    f"'{agent_name}' is class '{row['agent_class']}'."
+                )
 
-        # Block without result file
-        if not task_row["result_file"]:
+            cursor.execute(
+                "SELECT status, result_file FROM tasks WHERE id = ?", (task_id,)
+            )
+            task_row = cursor.fetchone()
+            if not task_row:
+                return f"Task #{task_id} not found."
+            if task_row["status"] == "closed":
+                return f"Task #{task_id} is already closed."
             return (
                 f"BLOCKED: Task #{task_id} has no result file. "
                 f"Agent must call submit_result before lead can close."
             )
 
-        cursor.execute(
-            "UPDATE tasks SET status = 'closed', updated_at = ? WHERE id = ?",
-            (now, task_id),
-        )
         conn.commit()
-        return f"Task #{task_id} closed: {task_row['title']}"
+        return f"Task #{task_id} closed: {closed_row['title']}"
     except Exception as e:
         return f"Error closing task: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 # ---------------------------------------------------------------------------
@@ -1617,54 +2052,48 @@ def claim_file(agent_name: str, file_path: str) -> str:
 
     conn = get_db()
     cursor = conn.cursor()
-    now = datetime.datetime.now().isoformat()
+    now = _now_iso()
     try:
-        # Verify agent exists
-        cursor.execute("SELECT name FROM agents WHERE name = ?", (agent_name,))
-        if not cursor.fetchone():
+        cursor.execute("BEGIN IMMEDIATE")
+        # Verify agent exists; heartbeat is throttled by _touch_agent
+        if _touch_agent(cursor, agent_name, now) is None:
             return f"BLOCKED: Agent '{agent_name}' not registered."
 
-        # Check if already claimed
+        # Claim the file unless someone already holds it
         cursor.execute(
-            "SELECT agent_name, claimed_at FROM file_claims WHERE file_path = ?",
-            (normalized,),
+            """INSERT INTO file_claims (file_path, agent_name, claimed_at) VALUES (?, ?, ?)
+               ON CONFLICT(file_path) DO NOTHING RETURNING 1""",
+            (normalized, agent_name, now),
         )
-        existing = cursor.fetchone()
-
-        if existing:
-            if existing["agent_name"] == agent_name:
-                return f"File already claimed by you: {normalized}"
-
-            # Auto-add to waitlist
-            cursor.execute(
-                """INSERT OR IGNORE INTO file_waitlist (file_path, agent_name, added_at)
-                   VALUES (?, ?, ?)""",
-                (normalized, agent_name, now),
-            )
+        if cursor.fetchone() is not None:
             conn.commit()
-            return (
-                f"BLOCKED: File '{normalized}' is claimed by '{existing['agent_name']}' "
-                f"(since {existing['claimed_at']}). "
-                f"You have been added to the waitlist."
-            )
+            return f"File claimed: {normalized} -> {agent_name}"
 
-        # Claim the file
+        # Already claimed — find out by whom
         cursor.execute(
-            "INSERT INTO file_claims (file_path, agent_name, claimed_at) VALUES (?, ?, ?)",
-            (normalized, agent_name, now),
+            "SELECT agent_name, claimed_at FROM file_claims WHERE file_path = ?",
+            (normalized,),
         )
+        existing = cursor.fetchone()
+        if existing["agent_name"] == agent_name:
+            return f"File already claimed by you: {normalized}"
 
-        # Update last_seen
+        # Auto-add to waitlist
         cursor.execute(
-            "UPDATE agents SET last_seen = ? WHERE name = ?", (now, agent_name)
+            """INSERT OR IGNORE INTO file_waitlist (file_path, agent_name, added_at)
+               VALUES (?, ?, ?)""",
+            (normalized, agent_name, now),
         )
-
         conn.commit()
-        return f"File claimed: {normalized} -> {agent_name}"
+        return (
+            f"BLOCKED: File '{normalized}' is claimed by '{existing['agent_name']}' "
+            f"(since {existing['claimed_at']}). "
+            f"You have been added to the waitlist."
+        )
     except Exception as e:
         return f"Error claiming file: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 @mcp.tool()
@@ -1679,56 +2108,48 @@ def release_file(agent_name: str, file_path: str, force: bool = False) -> str:
 
     conn = get_db()
     cursor = conn.cursor()
-    now = datetime.datetime.now().isoformat()
+    now = _now_iso()
     try:
-        # Verify agent exists
-        cursor.execute(
-            "SELECT name, agent_class FROM agents WHERE name = ?", (agent_name,)
-        )
-        agent_row = cursor.fetchone()
-        if not agent_row:
+        cursor.execute("BEGIN IMMEDIATE")
+        # Verify agent exists; heartbeat is throttled by _touch_agent
+        agent_row = _touch_agent(cursor, agent_name, now)
+        if agent_row is None:
             return f"BLOCKED: Agent '{agent_name}' not registered."
 
-        # Check if file is claimed
+        # Release the claim. Only the holder or lead (with force) can release it.
+        can_force = agent_row["agent_class"] == "lead" and force
         cursor.execute(
-            "SELECT agent_name FROM file_claims WHERE file_path = ?",
-            (normalized,),
+            "DELETE FROM file_claims WHERE file_path = ? AND (agent_name = ? OR ?) "
+            "RETURNING agent_name",
+            (normalized, agent_name, can_force),
         )
         claim = cursor.fetchone()
         if not claim:
-            return f"File '{normalized}' is not claimed by anyone."
+            # Nothing released — report why
+            cursor.execute(
+                "SELECT agent_name FROM file_claims WHERE file_path = ?",
+                (normalized,),
+            )
+            holder = cursor.fetchone()
+            if not holder:
+                return f"File '{normalized}' is not claimed by anyone."
+            return (
+                f"BLOCKED: File '{normalized}' is claimed by '{holder['agent_name']}'. "
+                f"Only the holder or lead (with force=True) can release it."
+            )
 
         claim_holder = claim["agent_name"]
 
-        # Permission check: only the holder or lead (with force) can release
-        if claim_holder != agent_name:
-            if agent_row["agent_class"] != "lead" or not force:
-                return (
-                    f"BLOCKED: File '{normalized}' is claimed by '{claim_holder}'. "
-                    f"Only the holder or lead (with force=True) can release it."
-                )
-
-        # Release the claim
+        # Clear the waitlist for this file, reading back who was waiting
+        # (RETURNING order is unspecified, so sort by arrival)
         cursor.execute(
-            "DELETE FROM file_claims WHERE file_path = ?", (normalized,)
-        )
-
-        # Check waitlist
-        cursor.execute(
-            "SELECT agent_name FROM file_waitlist WHERE file_path = ? ORDER BY added_at ASC",
+            "DELETE FROM file_waitlist WHERE file_path = ? RETURNING agent_name, added_at",
             (normalized,),
         )
-        waiters = [row["agent_name"] for row in cursor.fetchall()]
-
-        # Remove waitlist entries for this file
-        cursor.execute(
-            "DELETE FROM file_waitlist WHERE file_path = ?", (normalized,)
-        )
-
-        # Update last_seen
-        cursor.execute(
-            "UPDATE agents SET last_seen = ? WHERE name = ?", (now, agent_name)
-        )
+        waiters = [
+            row["agent_name"]
+            for row in sorted(cursor.fetchall(), key=lambda r: r["added_at"])
+        ]
 
         conn.commit()
 
@@ -1741,7 +2162,7 @@ def release_file(agent_name: str, file_path: str, force: bool = False) -> str:
     except Exception as e:
         return f"Error releasing file: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 @mcp.tool()
@@ -1750,7 +2171,7 @@ def get_claims(agent_name: str = "") -> str:
 
     agent_name: filter to claims held by this agent. Empty = all claims.
     """
-    conn = get_db()
+    conn = get_read_db()
     cursor = conn.cursor()
     try:
         if agent_name:
@@ -1762,13 +2183,13 @@ def get_claims(agent_name: str = "") -> str:
             cursor.execute(
                 "SELECT * FROM file_claims ORDER BY agent_name, claimed_at DESC"
             )
-        claims = [dict(row) for row in cursor.fetchall()]
+        claims = _dicts(cursor)
 
         # Also fetch waitlist info
         cursor.execute(
             "SELECT file_path, agent_name, added_at FROM file_waitlist ORDER BY added_at ASC"
         )
-        waitlist = [dict(row) for row in cursor.fetchall()]
+        waitlist = _dicts(cursor)
 
         if not claims and not waitlist:
             if agent_name:
@@ -1776,24 +2197,20 @@ def get_claims(agent_name: str = "") -> str:
             return "No active file claims."
 
         result_data = {"claims": claims, "waitlist": waitlist}
-        return json.dumps(result_data, indent=2)
+        return _dumps(result_data)
     except Exception as e:
         return f"Error getting claims: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 # ---------------------------------------------------------------------------
 # Phase 5 — Monitoring & Health tools
 # ---------------------------------------------------------------------------
 
-def _has_table(cursor: sqlite3.Cursor, table_name: str) -> bool:
-    """Check if a table exists in the database."""
-    cursor.execute(
-        "SELECT COUNT(*) FROM sqlite_master WHERE type='table' AND name=?",
-        (table_name,),
-    )
-    return cursor.fetchone()[0] > 0
+def _has_table(table_name: str) -> bool:
+    """Check if a table exists in the database (as of init_db)."""
+    return table_name in _TABLES
 
 
 def _safe_mtime(file_path: str) -> str | None:
@@ -1805,49 +2222,38 @@ def _safe_mtime(file_path: str) -> str | None:
         return None
 
 
-def _agent_judgment(last_seen: str | None, last_task_update: str | None,
-                    file_mtimes: list[str | None]) -> str:
+def _iso_ts(value: str | None) -> float | None:
+    """Return an ISO timestamp string as epoch seconds, or None if unset/unparseable."""
+    if not value:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+def _agent_judgment(last_seen_ts: float | None, last_task_update_ts: float | None,
+                    file_mtimes_ts: list[float]) -> str:
     """Return a summary judgment: active / idle / possibly dead.
 
     Checks (in order): recent file edits, last_seen, last task update.
+    All inputs are epoch seconds.
     """
-    now = datetime.datetime.now()
+    now_ts = time.time()
 
     # Check if any file was modified in the last 5 minutes
-    for mt in file_mtimes:
-        if mt:
-            try:
-                mtime_dt = datetime.datetime.fromisoformat(mt)
-                if (now - mtime_dt).total_seconds() < 5 * 60:
-                    return "active"
-            except ValueError:
-                pass
-
-    # Check last_seen
-    if last_seen:
-        try:
-            ls = datetime.datetime.fromisoformat(last_seen)
-            age_min = (now - ls).total_seconds() / 60
-            if age_min < 5:
-                return "active"
-            if age_min < 15:
-                return "idle"
-            return "possibly dead"
-        except ValueError:
-            pass
+    if file_mtimes_ts and now_ts - max(file_mtimes_ts) < 5 * 60:
+        return "active"
 
-    # Check last task update as fallback
-    if last_task_update:
-        try:
-            ltu = datetime.datetime.fromisoformat(last_task_update)
-            age_min = (now - ltu).total_seconds() / 60
+    # Check last_seen, then last task update as fallback
+    for ts in (last_seen_ts, last_task_update_ts):
+        if ts is not None:
+            age_min = (now_ts - ts) / 60
             if age_min < 5:
                 return "active"
             if age_min < 15:
                 return "idle"
             return "possibly dead"
-        except ValueError:
-            pass
 
     return "possibly dead"
 
@@ -1860,88 +2266,87 @@ def party_status() -> str:
     last_seen_mins_ago, open tasks count, activity counts, and claimed files (if available).
     Poll this every 2-5 minutes to monitor the raid.
     """
-    conn = get_db()
+    conn = get_read_db()
     cursor = conn.cursor()
-    now = datetime.datetime.now()
+    now_epoch = int(time.time())
     try:
-        cursor.execute("SELECT * FROM agents ORDER BY last_seen DESC")
-        agents = []
-        has_claims = _has_table(cursor, "file_claims")
+        has_claims = _has_table("file_claims")
 
-        for row in cursor.fetchall():
-            a = dict(row)
+        # Per-agent task and claim figures in one grouped pass per table
+        cursor.execute(
+            """SELECT assigned_to, COUNT(*) AS cnt, COALESCE(SUM(activity_count), 0) AS total_activity
+               FROM tasks
+               WHERE status IN ('open', 'assigned', 'in_progress')
+               GROUP BY assigned_to"""
+        )
+        task_counts = {row["assigned_to"]: row for row in cursor.fetchall()}
+
+        # Claimed files with mtime (Phase 4 may not exist yet)
+        claims_by_agent: dict[str, list[dict]] = {}
+        if has_claims:
+            try:
+                cursor.execute("SELECT agent_name, file_path, claimed_at FROM file_claims")
+                for claim in cursor.fetchall():
+                    fp = claim["file_path"]
+                    claims_by_agent.setdefault(claim["agent_name"], []).append({
+                        "file_path": fp,
+                        "claimed_at": claim["claimed_at"],
+                        "mtime": _safe_mtime(fp),
+                    })
+            except Exception:
+                pass
+
+        # Only the columns the dashboard reports, plus the inputs for hp and ages.
+        # The (potentially large) context text is never read.
+        cursor.execute(
+            """SELECT name, agent_class, model, registered_at, last_seen, last_inbox_check,
+                      context_updated_at, description, status, transport,
+                      context_tokens_used, context_tokens_limit,
+                      last_seen_epoch, context_updated_at_epoch
+               FROM agents ORDER BY last_seen DESC"""
+        )
+        agents = []
+        for a in _dicts(cursor):
             name = a["name"]
+            # Internal epoch mirrors and token counts — used for ages and hp, not reported
+            seen_epoch = a.pop("last_seen_epoch")
+            ctx_epoch = a.pop("context_updated_at_epoch")
+            tokens_used = a.pop("context_tokens_used")
+            tokens_limit = a.pop("context_tokens_limit")
 
             # HP summary
-            a["hp"] = _hp_summary(a.get("context_tokens_used"), a.get("context_tokens_limit"))
+            a["hp"] = _hp_summary(tokens_used, tokens_limit)
 
             # Staleness flag
             threshold = CLASS_STALENESS_SECONDS.get(a.get("agent_class", ""), None)
             stale = False
-            if threshold and a.get("context_updated_at"):
-                try:
-                    updated = datetime.datetime.fromisoformat(a["context_updated_at"])
-                    stale = (now - updated).total_seconds() > threshold
-                except ValueError:
-                    pass
-            elif threshold and not a.get("context_updated_at"):
+            if threshold and ctx_epoch is not None:
+                stale = now_epoch - ctx_epoch > threshold
+            elif threshold:
                 stale = True
             a["context_stale"] = stale
 
             # Last-seen age
-            last_seen_mins = None
-            if a.get("last_seen"):
-                try:
-                    ls = datetime.datetime.fromisoformat(a["last_seen"])
-                    last_seen_mins = int((now - ls).total_seconds() // 60)
-                except ValueError:
-                    pass
-            a["last_seen_mins_ago"] = last_seen_mins
+            a["last_seen_mins_ago"] = (
+                (now_epoch - seen_epoch) // 60 if seen_epoch is not None else None
+            )
 
             # Open tasks count and total activity across active tasks
-            cursor.execute(
-                """SELECT COUNT(*) as cnt, COALESCE(SUM(activity_count), 0) as total_activity
-                   FROM tasks
-                   WHERE assigned_to = ?
-                   AND status IN ('open', 'assigned', 'in_progress')""",
-                (name,),
-            )
-            task_row = cursor.fetchone()
-            a["open_tasks"] = task_row["cnt"]
-            a["total_activity"] = task_row["total_activity"]
+            task_row = task_counts.get(name)
+            a["open_tasks"] = task_row["cnt"] if task_row else 0
+            a["total_activity"] = task_row["total_activity"] if task_row else 0
 
-            # Claimed files with mtime (Phase 4 may not exist yet)
-            claimed_files = []
-            if has_claims:
-                try:
-                    cursor.execute(
-                        "SELECT file_path, claimed_at FROM file_claims WHERE agent_name = ?",
-                        (name,),
-                    )
-                    for claim in cursor.fetchall():
-                        fp = claim["file_path"]
-                        claimed_files.append({
-                            "file_path": fp,
-                            "claimed_at": claim["claimed_at"],
-                            "mtime": _safe_mtime(fp),
-                        })
-                except Exception:
-                    pass
-            a["claimed_files"] = claimed_files
-
-            # Strip verbose fields to keep the dashboard compact
-            for key in ("context", "context_tokens_used", "context_tokens_limit"):
-                a.pop(key, None)
+            a["claimed_files"] = claims_by_agent.get(name, [])
 
             agents.append(a)
 
         if not agents:
             return "No agents registered."
-        return json.dumps(agents, indent=2)
+        return _dumps(agents)
     except Exception as e:
         return f"Error getting party status: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 @mcp.tool()
@@ -1953,9 +2358,9 @@ def check_activity(agent_name: str) -> str:
 
     agent_name: the agent to check.
     """
-    conn = get_db()
+    conn = get_read_db()
     cursor = conn.cursor()
-    now = datetime.datetime.now()
+    now_ts = time.time()
     try:
         cursor.execute("SELECT * FROM agents WHERE name = ?", (agent_name,))
         row = cursor.fetchone()
@@ -1969,13 +2374,10 @@ def check_activity(agent_name: str) -> str:
             "last_seen": row["last_seen"],
         }
 
-        # Last-seen age
-        if row["last_seen"]:
-            try:
-                ls = datetime.datetime.fromisoformat(row["last_seen"])
-                result["last_seen_mins_ago"] = int((now - ls).total_seconds() // 60)
-            except ValueError:
-                pass
+        # Last-seen age — from the epoch mirror, no ISO parsing
+        last_seen_ts = row["last_seen_epoch"]
+        if last_seen_ts is not None:
+            result["last_seen_mins_ago"] = int((now_ts - last_seen_ts) // 60)
 
         # Active tasks — most recent updated_at first
         cursor.execute(
@@ -1986,14 +2388,14 @@ def check_activity(agent_name: str) -> str:
                ORDER BY updated_at DESC""",
             (agent_name,),
         )
-        active_tasks = [dict(t) for t in cursor.fetchall()]
+        active_tasks = _dicts(cursor)
         result["active_tasks"] = active_tasks
         result["last_task_update"] = active_tasks[0]["updated_at"] if active_tasks else None
 
         # Claimed files with mtime (Phase 4 may not exist yet)
         claimed_files = []
-        claimed_mtimes: list[str | None] = []
-        has_claims = _has_table(cursor, "file_claims")
+        mtimes_ts: list[float] = []
+        has_claims = _has_table("file_claims")
         if has_claims:
             try:
                 cursor.execute(
@@ -2002,13 +2404,18 @@ def check_activity(agent_name: str) -> str:
                 )
                 for claim in cursor.fetchall():
                     fp = claim["file_path"]
-                    mt = _safe_mtime(fp)
+                    try:
+                        st_mtime = os.stat(fp).st_mtime
+                    except OSError:
+                        st_mtime = None
                     claimed_files.append({
                         "file_path": fp,
                         "claimed_at": claim["claimed_at"],
-                        "mtime": mt,
+                        "mtime": (datetime.datetime.fromtimestamp(st_mtime).isoformat()
+                                  if st_mtime is not None else None),
                     })
-                    claimed_mtimes.append(mt)
+                    if st_mtime is not None:
+                        mtimes_ts.append(st_mtime)
             except Exception:
                 pass
         result["claimed_files"] = claimed_files
@@ -2023,22 +2430,26 @@ def check_activity(agent_name: str) -> str:
         # Zone directory mtime — if zones are directories, check for recent changes
         zone_mtimes: list[str | None] = []
         for z in zones:
-            if os.path.isdir(z):
-                zone_mtimes.append(_safe_mtime(z))
+            try:
+                st = os.stat(z)
+            except OSError:
+                continue
+            if stat.S_ISDIR(st.st_mode):
+                zone_mtimes.append(datetime.datetime.fromtimestamp(st.st_mtime).isoformat())
+                mtimes_ts.append(st.st_mtime)
         if zone_mtimes:
             result["zone_mtimes"] = zone_mtimes
 
         # Judgment — combine all file signals
-        all_mtimes = claimed_mtimes + zone_mtimes
         result["judgment"] = _agent_judgment(
-            row["last_seen"], result["last_task_update"], all_mtimes
+            last_seen_ts, _iso_ts(result["last_task_update"]), mtimes_ts
         )
 
-        return json.dumps(result, indent=2)
+        return _dumps(result)
     except Exception as e:
         return f"Error checking activity: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 @mcp.tool()
@@ -2051,7 +2462,7 @@ def check_freshness(agent_name: str, file_paths: str) -> str:
     agent_name: the agent to check freshness for.
     file_paths: comma-separated list of file paths to check.
     """
-    conn = get_db()
+    conn = get_read_db()
     cursor = conn.cursor()
     try:
         cursor.execute(
@@ -2072,20 +2483,20 @@ def check_freshness(agent_name: str, file_paths: str) -> str:
             # Never set context — everything is stale by definition
             stale_files = []
             for fp in paths:
-                mt = _safe_mtime(fp)
+                mt = _safe_mtime(fp)  # None iff the file doesn't exist
                 stale_files.append({
                     "file_path": fp,
                     "mtime": mt,
-                    "exists": os.path.exists(fp),
+                    "exists": mt is not None,
                     "stale": True,
                 })
-            return json.dumps({
+            return _dumps({
                 "agent_name": agent_name,
                 "context_updated_at": None,
                 "note": "Agent has never called set_context — all files considered stale.",
                 "files": stale_files,
                 "stale_count": len([f for f in stale_files if f["exists"]]),
-            }, indent=2)
+            })
 
         try:
             context_dt = datetime.datetime.fromisoformat(context_updated_at)
@@ -2097,21 +2508,21 @@ def check_freshness(agent_name: str, file_paths: str) -> str:
         stale_count = 0
 
         for fp in paths:
-            entry: dict = {"file_path": fp, "exists": os.path.exists(fp)}
-            if os.path.exists(fp):
-                try:
-                    file_mtime = os.path.getmtime(fp)
-                    entry["mtime"] = datetime.datetime.fromtimestamp(file_mtime).isoformat()
-                    entry["stale"] = file_mtime > context_ts
-                    if entry["stale"]:
-                        stale_count += 1
-                except OSError:
-                    entry["mtime"] = None
-                    entry["stale"] = False
-            else:
-                entry["mtime"] = None
-                entry["stale"] = False
-            files_result.append(entry)
+            # One stat per file answers both "exists?" and "modified when?"
+            try:
+                file_mtime = os.stat(fp).st_mtime
+            except OSError:
+                files_result.append({"file_path": fp, "exists": False, "mtime": None, "stale": False})
+                continue
+            stale = file_mtime > context_ts
+            if stale:
+                stale_count += 1
+            files_result.append({
+                "file_path": fp,
+                "exists": True,
+                "mtime": datetime.datetime.fromtimestamp(file_mtime).isoformat(),
+                "stale": stale,
+            })
 
         result = {
             "agent_name": agent_name,
@@ -2125,11 +2536,11 @@ def check_freshness(agent_name: str, file_paths: str) -> str:
                 f"Agent may be working with outdated data."
             )
 
-        return json.dumps(result, indent=2)
+        return _dumps(result)
     except Exception as e:
         return f"Error checking freshness: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 # ---------------------------------------------------------------------------
@@ -2158,11 +2569,17 @@ def cold_start(agent_name: str) -> str:
     """
     conn = get_db()
     cursor = conn.cursor()
-    now = datetime.datetime.now().isoformat()
+    now = _now_iso()
     try:
-        # Agent must be registered
+        # One write transaction: the snapshot below and the fenix consume/last_seen
+        # writes commit together
+        cursor.execute("BEGIN IMMEDIATE")
+
+        # Agent must be registered (and update last_seen in the same statement)
         cursor.execute(
-            "SELECT name, agent_class FROM agents WHERE name = ?", (agent_name,)
+            "UPDATE agents SET last_seen = ?, last_seen_epoch = strftime('%s', 'now') WHERE name = ? "
+            "RETURNING agent_class",
+            (now, agent_name),
         )
         agent_row = cursor.fetchone()
         if not agent_row:
@@ -2182,17 +2599,17 @@ def cold_start(agent_name: str) -> str:
         cursor.execute(
             "SELECT * FROM raid_log ORDER BY created_at DESC LIMIT 20"
         )
-        result["raid_log"] = [dict(row) for row in cursor.fetchall()]
+        result["raid_log"] = _dicts(cursor)
 
         # All open/assigned/in_progress tasks
         cursor.execute(
             "SELECT * FROM tasks WHERE status IN ('open', 'assigned', 'in_progress') ORDER BY created_at DESC"
         )
-        result["open_tasks"] = [dict(row) for row in cursor.fetchall()]
+        result["open_tasks"] = _dicts(cursor)
 
         # All registered agents (compact view)
         cursor.execute("SELECT name, agent_class, status, last_seen FROM agents ORDER BY last_seen DESC")
-        result["agents"] = [dict(row) for row in cursor.fetchall()]
+        result["agents"] = _dicts(cursor)
 
         # Convention file locations for this class
         briefing_files = CLASS_BRIEFING_FILES.get(agent_class, [])
@@ -2206,34 +2623,26 @@ def cold_start(agent_name: str) -> str:
             "code_owners": ".dead-drop/CODE_OWNERS.md",
         }
 
-        # Unconsumed fenix_down records for this agent — mark as consumed after reading
+        # Unconsumed fenix_down records for this agent — consume and read in one statement.
+        # consumed is reported as it was before the update; RETURNING order is
+        # unspecified, so sort newest first here.
         cursor.execute(
-            "SELECT * FROM fenix_down_records WHERE agent_name = ? AND consumed = 0 ORDER BY created_at DESC",
+            """UPDATE fenix_down_records SET consumed = 1
+               WHERE agent_name = ? AND consumed = 0
+               RETURNING id, agent_name, files, manifest, 0 AS consumed, created_at""",
             (agent_name,),
         )
-        fenix_records = [dict(row) for row in cursor.fetchall()]
+        fenix_records = _dicts(cursor)
+        fenix_records.sort(key=lambda r: (r["created_at"], r["id"]), reverse=True)
         result["fenix_down_records"] = fenix_records
 
-        if fenix_records:
-            # Mark them consumed
-            record_ids = [r["id"] for r in fenix_records]
-            cursor.execute(
-                f"UPDATE fenix_down_records SET consumed = 1 WHERE id IN ({','.join(['?'] * len(record_ids))})",
-                record_ids,
-            )
-
-        # Update last_seen
-        cursor.execute(
-            "UPDATE agents SET last_seen = ? WHERE name = ?", (now, agent_name)
-        )
-
         conn.commit()
 
-        return json.dumps(result, indent=2)
+        return _dumps(result)
     except Exception as e:
         return f"Error in cold_start: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 @mcp.tool()
@@ -2249,14 +2658,18 @@ def fenix_down(agent_name: str, files: str, manifest: str = "") -> str:
     """
     conn = get_db()
     cursor = conn.cursor()
-    now = datetime.datetime.now().isoformat()
+    now = _now_iso()
     try:
-        # Agent must be registered
+        cursor.execute("BEGIN IMMEDIATE")
+
+        # Agent must be registered — set status to phoenix_down in the same statement
+        # (rolled back below if the file list is empty)
         cursor.execute(
-            "SELECT name, agent_class FROM agents WHERE name = ?", (agent_name,)
+            "UPDATE agents SET status = 'phoenix_down', last_seen = ?, last_seen_epoch = strftime('%s', 'now') "
+            "WHERE name = ? RETURNING name",
+            (now, agent_name),
         )
-        agent_row = cursor.fetchone()
-        if not agent_row:
+        if not cursor.fetchone():
             return f"BLOCKED: Agent '{agent_name}' not registered."
 
         # Parse and clean file list
@@ -2274,12 +2687,6 @@ def fenix_down(agent_name: str, files: str, manifest: str = "") -> str:
         )
         record_id = cursor.lastrowid
 
-        # Update agent status to phoenix_down
-        cursor.execute(
-            "UPDATE agents SET status = 'phoenix_down', last_seen = ? WHERE name = ?",
-            (now, agent_name),
-        )
-
         conn.commit()
 
         result = (
@@ -2289,12 +2696,12 @@ def fenix_down(agent_name: str, files: str, manifest: str = "") -> str:
             f"Call cold_start('{agent_name}') to reload."
         )
         if manifest:
-            result += f" Manifest: {manifest[:120]}{'...' if len(manifest) > 120 else ''}"
+            result += f" Manifest: {_preview(manifest, 120)}"
         return result
     except Exception as e:
         return f"Error in fenix_down: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 @mcp.tool()
@@ -2309,12 +2716,10 @@ def debrief(agent_name: str, debrief_file: str) -> str:
     """
     conn = get_db()
     cursor = conn.cursor()
-    now = datetime.datetime.now().isoformat()
+    now = _now_iso()
     try:
         # Lead-only enforcement
-        cursor.execute(
-            "SELECT agent_class FROM agents WHERE name = ?", (agent_name,)
-        )
+        cursor.execute(_AGENT_CLASS_SQL, (agent_name,))
         row = cursor.fetchone()
         if not row:
             return f"BLOCKED: Agent '{agent_name}' not registered."
@@ -2324,20 +2729,23 @@ def debrief(agent_name: str, debrief_file: str) -> str:
                 f"'{agent_name}' is class '{row['agent_class']}'."
             )
 
-        # File must exist on disk
-        if not os.path.exists(debrief_file):
+        # File must exist on disk — one stat also captures what was filed
+        try:
+            st = os.stat(debrief_file)
+        except OSError:
             return f"BLOCKED: Debrief file does not exist: {debrief_file}"
+        mtime = datetime.datetime.fromtimestamp(st.st_mtime).isoformat(timespec="seconds")
 
-        # Record as critical raid log entry
+        # Record as critical raid log entry (end_session looks for the "DEBRIEF FILED:" prefix)
         cursor.execute(
             """INSERT INTO raid_log (agent_name, entry, priority, created_at)
                VALUES (?, ?, 'critical', ?)""",
-            (agent_name, f"DEBRIEF FILED: {debrief_file}", now),
+            (agent_name, f"DEBRIEF FILED: {debrief_file} (mtime={mtime}, size={st.st_size})", now),
         )
 
         # Update last_seen
         cursor.execute(
-            "UPDATE agents SET last_seen = ? WHERE name = ?", (now, agent_name)
+            "UPDATE agents SET last_seen = ?, last_seen_epoch = strftime('%s', 'now') WHERE name = ?", (now, agent_name)
         )
 
         conn.commit()
@@ -2345,7 +2753,7 @@ def debrief(agent_name: str, debrief_file: str) -> str:
     except Exception as e:
         return f"Error filing debrief: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 @mcp.tool()
@@ -2362,12 +2770,14 @@ def end_session(agent_name: str) -> str:
     """
     conn = get_db()
     cursor = conn.cursor()
-    now = datetime.datetime.now().isoformat()
+    now = _now_iso()
     try:
+        # One write transaction: the gate checks, the plan update, the summary
+        # counts and the SESSION ENDED entry all see the same snapshot
+        cursor.execute("BEGIN IMMEDIATE")
+
         # Lead-only enforcement
-        cursor.execute(
-            "SELECT agent_class FROM agents WHERE name = ?", (agent_name,)
-        )
+        cursor.execute(_AGENT_CLASS_SQL, (agent_name,))
         row = cursor.fetchone()
         if not row:
             return f"BLOCKED: Agent '{agent_name}' not registered."
@@ -2378,10 +2788,11 @@ def end_session(agent_name: str) -> str:
             )
 
         # Check for debrief — look for a critical raid log entry with "DEBRIEF FILED"
+        # (served by the idx_raid_log_debrief partial index; the LIKE must match it verbatim)
         cursor.execute(
-            "SELECT COUNT(*) FROM raid_log WHERE priority = 'critical' AND entry LIKE 'DEBRIEF FILED:%'"
+            "SELECT EXISTS (SELECT 1 FROM raid_log WHERE priority = 'critical' AND entry LIKE 'DEBRIEF FILED:%')"
         )
-        if cursor.fetchone()[0] == 0:
+        if not cursor.fetchone()[0]:
             return (
                 "BLOCKED: No debrief filed this session. "
                 "Lead must call debrief(agent_name, debrief_file) before ending the session."
@@ -2391,11 +2802,11 @@ def end_session(agent_name: str) -> str:
         cursor.execute(
             "SELECT id, title, status, assigned_to FROM tasks WHERE status IN ('open', 'assigned', 'in_progress')"
         )
-        open_tasks = [dict(row) for row in cursor.fetchall()]
+        open_tasks = cursor.fetchall()  # only formatted into the message, no dicts needed
         if open_tasks:
             task_list = "; ".join(
-                f"#{t['id']} {t['title']} ({t['status']}, assigned={t.get('assigned_to', 'none')})"
-                for t in open_tasks
+                f"#{task_id} {title} ({status}, assigned={assigned_to})"
+                for task_id, title, status, assigned_to in open_tasks
             )
             return (
                 f"BLOCKED: {len(open_tasks)} open task(s) remaining. "
@@ -2429,7 +2840,7 @@ def end_session(agent_name: str) -> str:
 
         # Agents registered
         cursor.execute("SELECT name, agent_class, status FROM agents ORDER BY name")
-        agents = [dict(row) for row in cursor.fetchall()]
+        agents = _dicts(cursor)
 
         # Fenix down records this session
         cursor.execute("SELECT COUNT(*) FROM fenix_down_records")
@@ -2454,17 +2865,27 @@ def end_session(agent_name: str) -> str:
             "ended_by": agent_name,
             "ended_at": now,
         }
-        return json.dumps(summary, indent=2)
+        return _dumps(summary)
     except Exception as e:
         return f"Error ending session: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 # ---------------------------------------------------------------------------
 # Phase 7 — Trigger Word tools
 # ---------------------------------------------------------------------------
 
+# get_triggers' reply depends only on TRIGGER_WORDS — build it once
+_TRIGGERS_RESPONSE = (
+    _dumps(TRIGGER_WORDS)
+    + "\n\nUsage: Include a trigger word in any send() message. "
+    + "Comms recognizes it automatically and tags the response."
+    + "\nSpecial: moon_crash auto-blocks all new task assignments."
+    + "\nSpecial: stand_down signals all daemons to exit gracefully."
+)
+
+
 @mcp.tool()
 def get_triggers() -> str:
     """Return the trigger word codebook — all brevity codes and their meanings.
@@ -2472,12 +2893,7 @@ def get_triggers() -> str:
     Use this to look up what a trigger word means, or to see the full list.
     Agents learn these on registration, but can call this anytime for a refresher.
     """
-    result = json.dumps(TRIGGER_WORDS, indent=2)
-    result += "\n\nUsage: Include a trigger word in any send() message. "
-    result += "Comms recognizes it automatically and tags the response."
-    result += "\nSpecial: moon_crash auto-blocks all new task assignments."
-    result += "\nSpecial: stand_down signals all daemons to exit gracefully."
-    return result
+    return _TRIGGERS_RESPONSE
 
 
 @mcp.tool()
@@ -2490,12 +2906,10 @@ def clear_moon_crash(agent_name: str) -> str:
     """
     conn = get_db()
     cursor = conn.cursor()
-    now = datetime.datetime.now().isoformat()
+    now = _now_iso()
     try:
         # Lead-only enforcement
-        cursor.execute(
-            "SELECT agent_class FROM agents WHERE name = ?", (agent_name,)
-        )
+        cursor.execute(_AGENT_CLASS_SQL, (agent_name,))
         row = cursor.fetchone()
         if not row:
             return f"BLOCKED: Agent '{agent_name}' not registered."
@@ -2523,7 +2937,7 @@ def clear_moon_crash(agent_name: str) -> str:
     except Exception as e:
         return f"Error clearing moon_crash: {e}"
     finally:
-        conn.close()
+        conn.rollback()
 
 
 # ---------------------------------------------------------------------------
@@ -2535,14 +2949,13 @@ CREW_SEARCH_PATHS = [
     os.path.expanduser("~/.minion-swarm"),
 ]
 
-# Try to find bundled crews from minion-swarm package
-try:
-    import minion_swarm
-    _pkg_crews = os.path.join(os.path.dirname(minion_swarm.__file__), "data", "crews")
+# Try to find bundled crews from minion-swarm package. find_spec locates the
+# package on disk without importing (and running) it at server start.
+_swarm_spec = importlib.util.find_spec("minion_swarm")
+if _swarm_spec is not None and _swarm_spec.submodule_search_locations:
+    _pkg_crews = os.path.join(_swarm_spec.submodule_search_locations[0], "data", "crews")
     if os.path.isdir(_pkg_crews):
         CREW_SEARCH_PATHS.insert(0, _pkg_crews)
-except ImportError:
-    pass
 
 
 def _find_crew_file(crew_name: str) -> str | None:
@@ -2754,14 +3167,14 @@ def spawn_party(agent_name: str, crew: str, project_dir: str = ".", agents: str
     cursor = conn.cursor()
     try:
         # Lead-only check
-        cursor.execute("SELECT agent_class FROM agents WHERE name = ?", (agent_name,))
+        cursor.execute(_AGENT_CLASS_SQL, (agent_name,))
         row = cursor.fetchone()
         if not row:
             return f"BLOCKED: Agent '{agent_name}' not registered."
         if row["agent_class"] != "lead":
             return f"BLOCKED: Only lead-class agents can spawn a party. '{agent_name}' is '{row['agent_class']}'."
     finally:
-        conn.close()
+        conn.rollback()
 
     if not shutil.which("tmux"):
         return "BLOCKED: tmux is required. Install with: brew install tmux"
@@ -2830,7 +3243,7 @@ def spawn_party(agent_name: str, crew: str, project_dir: str = ".", agents: str
         registered = {row["name"] for row in cursor.fetchall()}
         conn.commit()
     finally:
-        conn.close()
+        conn.rollback()
 
     # Rename colliding agents (thief → thief2, thief3, ...)
     # and patch the crew config so the system prompt uses the new name
@@ -2895,10 +3308,10 @@ def stand_down(agent_name: str, crew: str = "") -> str:
     """
     conn = get_db()
     cursor = conn.cursor()
-    now = datetime.datetime.now().isoformat()
+    now = _now_iso()
     try:
         # Lead-only check
-        cursor.execute("SELECT agent_class FROM agents WHERE name = ?", (agent_name,))
+        cursor.execute(_AGENT_CLASS_SQL, (agent_name,))
         row = cursor.fetchone()
         if not row:
             return f"BLOCKED: Agent '{agent_name}' not registered."
@@ -2915,7 +3328,7 @@ def stand_down(agent_name: str, crew: str = "") -> str:
         )
         conn.commit()
     finally:
-        conn.close()
+        conn.rollback()
 
     if crew:
         # Stop specific crew